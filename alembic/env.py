@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from app.config import settings
 from app.models import Base
 from app.models import building, activity, organization  # noqa
+from app.models import cache_change  # noqa
 
 load_dotenv('.env')
 
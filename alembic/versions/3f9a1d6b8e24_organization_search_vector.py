@@ -0,0 +1,132 @@
+"""organization full-text search vector
+
+Revision ID: 3f9a1d6b8e24
+Revises: 7b2d4e8a1c55
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1d6b8e24'
+down_revision = '7b2d4e8a1c55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'organization',
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+    )
+    op.execute("""
+        CREATE FUNCTION organization_search_vector(org_id integer, org_name text)
+        RETURNS tsvector
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT setweight(to_tsvector('russian', coalesce(org_name, '')), 'A')
+                || setweight(to_tsvector('russian', coalesce((
+                    SELECT string_agg(a.name, ' ')
+                    FROM organization_activities oa
+                    JOIN activity a ON a.id = oa.activity_id
+                    WHERE oa.organization_id = org_id
+                ), '')), 'B')
+        $$
+        """)
+    op.execute("""
+        CREATE FUNCTION organization_search_vector_trg()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            NEW.search_vector := organization_search_vector(NEW.id, NEW.name);
+            RETURN NEW;
+        END
+        $$
+        """)
+    op.execute("""
+        CREATE TRIGGER organization_search_vector_upd
+        BEFORE INSERT OR UPDATE OF name ON organization
+        FOR EACH ROW EXECUTE FUNCTION organization_search_vector_trg()
+        """)
+    op.execute("""
+        CREATE FUNCTION organization_activities_search_vector_trg()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            org_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                org_id := OLD.organization_id;
+            ELSE
+                org_id := NEW.organization_id;
+            END IF;
+            UPDATE organization
+            SET search_vector = organization_search_vector(id, name)
+            WHERE id = org_id;
+            RETURN NULL;
+        END
+        $$
+        """)
+    op.execute("""
+        CREATE TRIGGER organization_activities_search_vector_upd
+        AFTER INSERT OR DELETE ON organization_activities
+        FOR EACH ROW EXECUTE FUNCTION organization_activities_search_vector_trg()
+        """)
+    op.execute("""
+        CREATE FUNCTION activity_search_vector_trg()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE organization o
+            SET search_vector = organization_search_vector(o.id, o.name)
+            FROM organization_activities oa
+            WHERE oa.organization_id = o.id AND oa.activity_id = NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """)
+    op.execute("""
+        CREATE TRIGGER activity_search_vector_upd
+        AFTER UPDATE OF name ON activity
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION activity_search_vector_trg()
+        """)
+    op.execute(
+        'UPDATE organization '
+        'SET search_vector = organization_search_vector(id, name)'
+    )
+    op.create_index(
+        'ix_organization_search_vector',
+        'organization',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_organization_search_vector', table_name='organization')
+    op.execute('DROP TRIGGER IF EXISTS activity_search_vector_upd ON activity')
+    op.execute(
+        'DROP TRIGGER IF EXISTS organization_activities_search_vector_upd '
+        'ON organization_activities'
+    )
+    op.execute(
+        'DROP TRIGGER IF EXISTS organization_search_vector_upd '
+        'ON organization'
+    )
+    op.execute('DROP FUNCTION IF EXISTS activity_search_vector_trg()')
+    op.execute(
+        'DROP FUNCTION IF EXISTS organization_activities_search_vector_trg()'
+    )
+    op.execute('DROP FUNCTION IF EXISTS organization_search_vector_trg()')
+    op.execute(
+        'DROP FUNCTION IF EXISTS organization_search_vector(integer, text)'
+    )
+    op.drop_column('organization', 'search_vector')
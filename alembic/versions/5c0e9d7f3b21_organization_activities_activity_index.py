@@ -0,0 +1,32 @@
+"""organization_activities activity_id index
+
+Revision ID: 5c0e9d7f3b21
+Revises: a23dab1b2de3
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e9d7f3b21'
+down_revision = 'a23dab1b2de3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f('ix_organization_activities_activity_id'),
+        'organization_activities',
+        ['activity_id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_organization_activities_activity_id'),
+        table_name='organization_activities',
+    )
@@ -0,0 +1,35 @@
+"""organization name trigram index
+
+Revision ID: 7b2d4e8a1c55
+Revises: e41f6a2c9d08
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4e8a1c55'
+down_revision = 'e41f6a2c9d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    available = conn.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if available is None:
+        # Без расширения поиск по названию выполняется in-process индексом.
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_organization_name_trgm '
+        'ON organization USING gin (lower(name) gin_trgm_ops)'
+    )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_organization_name_trgm')
@@ -0,0 +1,68 @@
+"""organization phone digits
+
+Revision ID: 9c4e2b7d1f03
+Revises: 3f9a1d6b8e24
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9c4e2b7d1f03'
+down_revision = '3f9a1d6b8e24'
+branch_labels = None
+depends_on = None
+
+NON_DIGITS_RE = re.compile(r'\D')
+
+
+def normalize_phone(number):
+    # Копия app.utils.phone.normalize на момент миграции: приложение может
+    # менять правило, а заполненные этой ревизией данные — нет.
+    digits = NON_DIGITS_RE.sub('', number)
+    if len(digits) == 11 and digits[0] == '8':
+        return '7' + digits[1:]
+    if len(digits) == 10:
+        return '7' + digits
+    return digits
+
+
+def upgrade():
+    op.add_column(
+        'organizationphone',
+        sa.Column('phone_digits', sa.String(length=32), nullable=True),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text('SELECT id, phone_number FROM organizationphone')
+    ).all()
+    if rows:
+        conn.execute(
+            sa.text(
+                'UPDATE organizationphone SET phone_digits = :digits '
+                'WHERE id = :id'
+            ),
+            [
+                {'id': id_, 'digits': normalize_phone(number)}
+                for id_, number in rows
+            ],
+        )
+    op.alter_column('organizationphone', 'phone_digits', nullable=False)
+    op.create_index(
+        op.f('ix_organizationphone_phone_digits'),
+        'organizationphone',
+        ['phone_digits'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_organizationphone_phone_digits'),
+        table_name='organizationphone',
+    )
+    op.drop_column('organizationphone', 'phone_digits')
@@ -0,0 +1,53 @@
+"""building geohash
+
+Revision ID: a23dab1b2de3
+Revises: bd7e6a8605e2
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils import geohash
+
+# revision identifiers, used by Alembic.
+revision = 'a23dab1b2de3'
+down_revision = 'bd7e6a8605e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'building',
+        sa.Column(
+            'geohash',
+            sa.String(length=geohash.MAX_PRECISION, collation='C'),
+            nullable=True,
+        ),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text('SELECT id, latitude, longitude FROM building')
+    ).all()
+    if rows:
+        conn.execute(
+            sa.text('UPDATE building SET geohash = :geohash WHERE id = :id'),
+            [
+                {
+                    'id': id_,
+                    'geohash': geohash.encode(float(lat), float(lon)),
+                }
+                for id_, lat, lon in rows
+            ],
+        )
+    op.alter_column('building', 'geohash', nullable=False)
+    op.create_index(
+        op.f('ix_building_geohash'), 'building', ['geohash'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_building_geohash'), table_name='building')
+    op.drop_column('building', 'geohash')
@@ -0,0 +1,86 @@
+"""cache change log
+
+Revision ID: d8b3f1a6c2e7
+Revises: 9c4e2b7d1f03
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f1a6c2e7'
+down_revision = '9c4e2b7d1f03'
+branch_labels = None
+depends_on = None
+
+TABLES = ('building', 'organization', 'activity')
+
+
+def upgrade():
+    op.create_table(
+        'cachechange',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'xid',
+            sa.BigInteger(),
+            server_default=sa.text('pg_current_xact_id()::text::bigint'),
+            nullable=False,
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_cachechange')),
+    )
+    op.create_index(
+        'ix_cachechange_table_name_xid',
+        'cachechange',
+        ['table_name', 'xid'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_cachechange_created_at'),
+        'cachechange',
+        ['created_at'],
+        unique=False,
+    )
+    op.execute("""
+        CREATE FUNCTION cache_change_log_trg()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO cachechange (table_name, row_id)
+                VALUES (TG_TABLE_NAME, OLD.id);
+            ELSE
+                INSERT INTO cachechange (table_name, row_id)
+                VALUES (TG_TABLE_NAME, NEW.id);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_cache_change_log
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION cache_change_log_trg()
+            """)
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(
+            f'DROP TRIGGER IF EXISTS {table}_cache_change_log ON {table}'
+        )
+    op.execute('DROP FUNCTION IF EXISTS cache_change_log_trg()')
+    op.drop_index(op.f('ix_cachechange_created_at'), table_name='cachechange')
+    op.drop_index('ix_cachechange_table_name_xid', table_name='cachechange')
+    op.drop_table('cachechange')
@@ -0,0 +1,47 @@
+"""activity materialized path
+
+Revision ID: e41f6a2c9d08
+Revises: 5c0e9d7f3b21
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e41f6a2c9d08'
+down_revision = '5c0e9d7f3b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'activity',
+        sa.Column('path', sa.String(length=255, collation='C'), nullable=True),
+    )
+    op.execute("""
+        WITH RECURSIVE tree AS (
+            SELECT id, id::text || '.' AS path
+            FROM activity
+            WHERE parent_id IS NULL
+            UNION ALL
+            SELECT a.id, t.path || a.id::text || '.'
+            FROM activity a
+            JOIN tree t ON a.parent_id = t.id
+        )
+        UPDATE activity
+        SET path = tree.path
+        FROM tree
+        WHERE activity.id = tree.id
+        """)
+    op.alter_column('activity', 'path', nullable=False)
+    op.create_index(
+        op.f('ix_activity_path'), 'activity', ['path'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_activity_path'), table_name='activity')
+    op.drop_column('activity', 'path')
@@ -1,6 +1,7 @@
+from typing import Literal
 from urllib.parse import quote_plus
 
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +18,33 @@ class Settings(BaseSettings):
         API_KEY: API ключ для доступа к роутам.
         APP_NAME: название приложения.
         DEBUG: флаг debug.
+        CACHE_CHECK_INTERVAL: период в секундах, не чаще которого in-process
+            кэши сверяются с журналом изменений БД.
+        CACHE_CHANGELOG_RETENTION: время хранения записей журнала изменений,
+            секунды; кэш, не сверявшийся дольше половины этого срока,
+            перестраивается целиком.
+        CACHE_SYNC_MAX_CHANGES: сколько измененных строк кэш применяет по
+            одной; при большем количестве он перестраивается целиком.
+        SPATIAL_INDEX_ENABLED: использовать in-process индекс зданий для
+            геопоиска.
+        SPATIAL_INDEX_CELL_DEG: размер ячейки сетки индекса зданий, градусы.
+        FACET_COUNTS_TTL: время жизни закэшированных количеств организаций
+            по видам деятельности, секунды.
+        TOTAL_COUNTS_TTL: время жизни закэшированных точных общих количеств
+            строк списков, секунды.
+        COUNT_EXACT_LIMIT: общее количество считается точно, если оценка
+            планировщика не больше этого числа строк, иначе возвращается
+            оценка.
+        NAME_SEARCH_BACKEND: поиск по подстроке названия: "trigram" — в БД
+            по индексу pg_trgm, "memory" — по in-process индексу триграмм,
+            "auto" — в памяти, только если индекса pg_trgm нет.
+        FUZZY_MAX_DISTANCE: максимальное расстояние Левенштейна между словом
+            запроса и словом названия при нечетком поиске (0–3).
+        CLUSTER_MAX_CELLS: максимальное количество ячеек сетки в области
+            запроса кластеров; более крупную область нужно запрашивать с
+            меньшим масштабом.
+        EXPORT_BATCH_SIZE: количество организаций, читаемых из БД за раз
+            при потоковой выгрузке справочника.
     """
 
     DB_USER: str
@@ -30,6 +58,19 @@ class Settings(BaseSettings):
     APP_NAME: str = "Organizations REST API"
     DEBUG: bool = False
 
+    CACHE_CHECK_INTERVAL: float = 5.0
+    CACHE_CHANGELOG_RETENTION: float = Field(3600.0, gt=0)
+    CACHE_SYNC_MAX_CHANGES: int = Field(10000, ge=0)
+    SPATIAL_INDEX_ENABLED: bool = True
+    SPATIAL_INDEX_CELL_DEG: float = 0.01
+    FACET_COUNTS_TTL: float = 60.0
+    TOTAL_COUNTS_TTL: float = 60.0
+    COUNT_EXACT_LIMIT: int = 10000
+    NAME_SEARCH_BACKEND: Literal["auto", "trigram", "memory"] = "auto"
+    FUZZY_MAX_DISTANCE: int = Field(2, ge=0, le=3)
+    CLUSTER_MAX_CELLS: int = Field(10000, ge=1)
+    EXPORT_BATCH_SIZE: int = Field(1000, ge=1)
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra='allow'
     )
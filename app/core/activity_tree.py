@@ -0,0 +1,128 @@
+import asyncio
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from app.core.cache import CachedPayload, VersionedCache
+from app.crud.crud_activity import activity_crud
+from app.models.activity import Activity
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityNode:
+    """Узел дерева видов деятельности.
+
+    Attributes:
+        id: Идентификатор.
+        name: Название.
+        parent_id: Идентификатор родителя.
+        level: Уровень вложенности.
+    """
+
+    id: int
+    name: str
+    parent_id: int | None
+    level: int
+
+
+class ActivityTree(VersionedCache):
+    """In-process дерево видов деятельности с готовыми JSON-ответами.
+
+    Таблица `activity` маленькая и почти не меняется, поэтому дерево
+    загружается целиком и перестраивается при любом изменении. JSON всего
+    дерева и каждого поддерева сериализуется один раз при перестроении.
+
+    Attributes:
+        nodes: Узлы по идентификатору.
+        children: Идентификаторы прямых потомков по идентификатору узла.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустое дерево."""
+        super().__init__(activity_crud)
+        self.nodes: dict[int, ActivityNode] = {}
+        self.children: dict[int | None, list[int]] = {}
+        self._tree_payload = CachedPayload.from_obj([])
+        self._subtree_payloads: dict[int, CachedPayload] = {}
+
+    async def _reload(self, session: AsyncSession) -> None:
+        rows = await activity_crud.get_multi(
+            session, skip=0, limit=None, order_by=Activity.id
+        )
+        nodes = {
+            a.id: ActivityNode(
+                id=a.id, name=a.name, parent_id=a.parent_id, level=a.level
+            )
+            for a in rows
+        }
+        (
+            self.children,
+            self._tree_payload,
+            self._subtree_payloads,
+        ) = await asyncio.to_thread(self._build, nodes)
+        self.nodes = nodes
+
+    @staticmethod
+    def _build(
+        nodes: dict[int, ActivityNode],
+    ) -> tuple[
+        dict[int | None, list[int]], CachedPayload, dict[int, CachedPayload]
+    ]:
+        """Строит связи узлов и сериализует дерево и все поддеревья в JSON."""
+        children: dict[int | None, list[int]] = {}
+        for node in nodes.values():
+            children.setdefault(node.parent_id, []).append(node.id)
+        dicts: dict[int, dict] = {}
+
+        def _node(id_: int) -> dict:
+            node = nodes[id_]
+            dicts[id_] = {
+                "id": node.id,
+                "name": node.name,
+                "parent_id": node.parent_id,
+                "level": node.level,
+                "children": [_node(c) for c in children.get(id_, [])],
+            }
+            return dicts[id_]
+
+        roots = [
+            id_
+            for id_, node in nodes.items()
+            if node.parent_id is None or node.parent_id not in nodes
+        ]
+        tree_payload = CachedPayload.from_obj([_node(r) for r in roots])
+        subtree_payloads = {
+            id_: CachedPayload.from_obj(d) for id_, d in dicts.items()
+        }
+        return children, tree_payload, subtree_payloads
+
+    def _size(self) -> int:
+        return len(self.nodes)
+
+    def tree_payload(self) -> CachedPayload:
+        """Возвращает сериализованное дерево целиком."""
+        return self._tree_payload
+
+    def subtree_payload(self, activity_id: int) -> CachedPayload | None:
+        """Возвращает сериализованное поддерево узла.
+
+        Args:
+            activity_id: Идентификатор корня поддерева.
+
+        Returns:
+            Готовый ответ или None, если узел не найден.
+        """
+        return self._subtree_payloads.get(activity_id)
+
+
+activity_tree = ActivityTree()
+
+
+@event.listens_for(Activity, "after_insert")
+@event.listens_for(Activity, "after_update")
+@event.listens_for(Activity, "after_delete")
+def _track_activity_change(mapper, connection, target: Activity) -> None:
+    """Передает дереву вид деятельности, измененный через ORM."""
+    activity_tree.mark_changed(object_session(target), target.id)
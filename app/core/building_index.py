@@ -0,0 +1,66 @@
+import asyncio
+from decimal import Decimal
+from typing import Sequence
+
+from sqlalchemy import Row, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from app.config import settings
+from app.core.cache import VersionedCache
+from app.crud.crud_building import building_crud
+from app.models.building import Building
+from app.utils.grid_index import GridIndex
+
+
+class BuildingIndex(VersionedCache):
+    """In-process пространственный индекс зданий.
+
+    Строится из таблицы `building` при старте приложения и применяет
+    изменения зданий из журнала.
+
+    Attributes:
+        grid: Сетка с координатами зданий.
+    """
+
+    def __init__(self, cell_deg: float) -> None:
+        """Создает пустой индекс.
+
+        Args:
+            cell_deg: Размер ячейки сетки в градусах.
+        """
+        super().__init__(building_crud)
+        self.grid = GridIndex(cell_deg)
+
+    async def _reload(self, session: AsyncSession) -> None:
+        rows = await building_crud.coordinates(session)
+        self.grid = await asyncio.to_thread(self._build, rows)
+
+    def _build(
+        self, rows: Sequence[Row[tuple[int, Decimal, Decimal]]]
+    ) -> GridIndex:
+        grid = GridIndex(self.grid.cell_deg)
+        for id_, lat, lon in rows:
+            grid.upsert(id_, float(lat), float(lon))
+        return grid
+
+    async def _update(self, session: AsyncSession, ids: Sequence[int]) -> None:
+        rows = await building_crud.coordinates(session, ids=ids)
+        for id_ in set(ids).difference(row[0] for row in rows):
+            self.grid.remove(id_)
+        for id_, lat, lon in rows:
+            self.grid.upsert(id_, float(lat), float(lon))
+
+    def _size(self) -> int:
+        return len(self.grid)
+
+
+building_index = BuildingIndex(settings.SPATIAL_INDEX_CELL_DEG)
+
+
+@event.listens_for(Building, "after_insert")
+@event.listens_for(Building, "after_update")
+@event.listens_for(Building, "after_delete")
+def _track_building_change(mapper, connection, target: Building) -> None:
+    """Передает индексу зданий здание, измененное через ORM."""
+    building_index.mark_changed(object_session(target), target.id)
@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic
+from typing import Any, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.crud_base import CRUDBase
+from app.crud.crud_cache_change import cache_change_crud
+
+logger = logging.getLogger(__name__)
+
+# Ключ `Session.info`: измененные текущей транзакцией строки по кэшам.
+_CHANGED_CACHES = "changed_versioned_caches"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPayload:
+    """Заранее сериализованный JSON-ответ со строгим ETag.
+
+    Attributes:
+        body: Тело ответа в UTF-8.
+        etag: Строгий ETag, производный от тела.
+    """
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_obj(cls, obj: Any) -> "CachedPayload":
+        """Сериализует объект в JSON и вычисляет ETag.
+
+        Args:
+            obj: JSON-совместимый объект.
+
+        Returns:
+            Готовый к отдаче ответ.
+        """
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        data = body.encode("utf-8")
+        return cls(body=data, etag=f'"{hashlib.sha256(data).hexdigest()}"')
+
+
+class VersionedCache(ABC):
+    """Базовый in-process кэш, синхронизируемый с таблицей БД по журналу.
+
+    Триггеры таблицы записывают в журнал `cachechange` идентификаторы
+    измененных строк с номером транзакции. Кэш хранит курсор — xmin снимка,
+    взятого перед последней синхронизацией: транзакции с меньшими номерами
+    к тому моменту завершены и уже учтены. Не чаще раза в `check_interval`
+    секунд кэш читает из журнала строки транзакций не раньше курсора и
+    применяет их через `_update`. Строки, зафиксированные через ORM этого
+    процесса, применяются при следующем обращении без ожидания интервала.
+
+    Кэш перестраивается целиком через `_reload` при первой загрузке, если
+    изменений больше `CACHE_SYNC_MAX_CHANGES` или половины закэшированных
+    строк, а также если последняя синхронизация была раньше половины срока
+    хранения журнала `CACHE_CHANGELOG_RETENTION`. Пока идет синхронизация
+    загруженного кэша, остальные запросы не ждут ее и читают прежние данные.
+
+    Attributes:
+        crud: CRUD таблицы-источника.
+        check_interval: Период сверки с журналом в секундах.
+    """
+
+    def __init__(
+        self, crud: CRUDBase, check_interval: float | None = None
+    ) -> None:
+        """Создает экземпляр кэша.
+
+        Args:
+            crud: CRUD таблицы-источника.
+            check_interval: Период сверки с журналом, по умолчанию из
+                настроек.
+        """
+        self.crud = crud
+        self.check_interval = (
+            settings.CACHE_CHECK_INTERVAL
+            if check_interval is None
+            else check_interval
+        )
+        self._cursor: int | None = None
+        self._synced_at = 0.0
+        self._checked_at = 0.0
+        self._pending: set[int] = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Признак того, что кэш хотя бы раз загружен."""
+        return self._cursor is not None
+
+    def invalidate(self) -> None:
+        """Требует сверить кэш с журналом при следующем обращении."""
+        self._checked_at = 0.0
+
+    def mark_changed(self, session: Session | None, id_: int) -> None:
+        """Отмечает, что транзакция сессии изменила строку таблицы кэша.
+
+        Строка применяется после фиксации транзакции, а не сразу: чтение до
+        фиксации не увидело бы изменений.
+
+        Args:
+            session: Сессия ORM, в которой изменен объект; без сессии кэш
+                сверяется с журналом при следующем обращении.
+            id_: Идентификатор строки.
+        """
+        if session is None:
+            self.invalidate()
+            return
+        changed = session.info.setdefault(_CHANGED_CACHES, {})
+        changed.setdefault(self, set()).add(id_)
+
+    def _committed(self, ids: set[int]) -> None:
+        """Запоминает строки, измененные зафиксированной транзакцией."""
+        self._pending |= ids
+        self.invalidate()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._cursor is not None
+            and not self._pending
+            and monotonic() - self._checked_at < self.check_interval
+        )
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        """Применяет к кэшу изменения таблицы, если пора сверить журнал.
+
+        Args:
+            session: Асинхронная сессия БД.
+        """
+        if self._is_fresh() or (self.loaded and self._lock.locked()):
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            pending, self._pending = self._pending, set()
+            try:
+                await self._sync(session, pending)
+            except BaseException:
+                self._pending |= pending
+                raise
+
+    async def _sync(self, session: AsyncSession, pending: set[int]) -> None:
+        """Применяет изменения журнала и строки, зафиксированные в процессе.
+
+        Args:
+            session: Асинхронная сессия БД.
+            pending: Строки, измененные через ORM этого процесса.
+        """
+        cursor = await cache_change_crud.cursor(session)
+        ids: set[int] | None = None
+        retention = settings.CACHE_CHANGELOG_RETENTION
+        if (
+            self._cursor is not None
+            and monotonic() - self._synced_at < retention / 2
+        ):
+            limit = min(settings.CACHE_SYNC_MAX_CHANGES, self._size() // 2)
+            ids = pending | set(
+                await cache_change_crud.changed_ids(
+                    session,
+                    self.crud.model.__tablename__,
+                    self._cursor,
+                    limit=limit + 1,
+                )
+            )
+            if len(ids) > limit:
+                ids = None
+        if ids is None:
+            await self._reload(session)
+        elif ids:
+            await self._update(session, sorted(ids))
+        self._cursor = cursor
+        self._synced_at = self._checked_at = monotonic()
+
+    @abstractmethod
+    async def _reload(self, session: AsyncSession) -> None:
+        """Полностью перестраивает кэш.
+
+        Новые структуры строятся в отдельном потоке и подменяют прежние
+        целиком, чтобы не блокировать цикл событий.
+        """
+
+    async def _update(self, session: AsyncSession, ids: Sequence[int]) -> None:
+        """Применяет текущее состояние строк `ids`, удаляя исчезнувшие.
+
+        По умолчанию кэш перестраивается целиком.
+        """
+        await self._reload(session)
+
+    @abstractmethod
+    def _size(self) -> int:
+        """Возвращает количество закэшированных строк таблицы."""
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changed_caches(session: Session) -> None:
+    """Передает кэшам строки, измененные в зафиксированной транзакции."""
+    for cache, ids in session.info.pop(_CHANGED_CACHES, {}).items():
+        cache._committed(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_caches(session: Session) -> None:
+    """Забывает изменения отмененной транзакции."""
+    session.info.pop(_CHANGED_CACHES, None)
+
+
+async def prune_cache_changes(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Периодически удаляет из журнала изменений устаревшие записи.
+
+    Записи хранятся `CACHE_CHANGELOG_RETENTION` секунд; ошибки БД не
+    прерывают цикл, очистка повторяется на следующей итерации.
+
+    Args:
+        session_factory: Фабрика асинхронных сессий.
+    """
+    retention = timedelta(seconds=settings.CACHE_CHANGELOG_RETENTION)
+    while True:
+        try:
+            async with session_factory() as session:
+                await cache_change_crud.prune(session, retention)
+                await session.commit()
+        except SQLAlchemyError:
+            logger.exception("Не удалось очистить журнал изменений кэшей")
+        await asyncio.sleep(retention.total_seconds() / 4)
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+
+from sqlalchemy import Select, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.crud_base import CRUDBase
+from app.models.activity import Activity
+from app.models.building import Building
+from app.models.organization import Organization
+
+
+class CountsCache:
+    """LRU-кэш результатов подсчета строк.
+
+    Запись живет не дольше `ttl` секунд и сбрасывается целиком при любой
+    записи организаций, зданий или видов деятельности через ORM.
+
+    Attributes:
+        ttl: Время жизни записи в секундах.
+        max_entries: Максимальное количество записей.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        """Создает пустой кэш.
+
+        Args:
+            ttl: Время жизни записи в секундах.
+            max_entries: Максимальное количество записей.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Возвращает закэшированный результат или None.
+
+        Args:
+            key: Ключ подсчета.
+
+        Returns:
+            Результат подсчета или None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, counts = entry
+        if monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return counts
+
+    def put(self, key: Hashable, counts: Any) -> None:
+        """Сохраняет результат подсчета.
+
+        Args:
+            key: Ключ подсчета.
+            counts: Результат подсчета.
+        """
+        self._entries[key] = (monotonic(), counts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Сбрасывает все записи."""
+        self._entries.clear()
+
+
+# Количества организаций по поддеревьям видов деятельности.
+facet_counts = CountsCache(settings.FACET_COUNTS_TTL)
+# Общие количества строк списков, посчитанные точно.
+total_counts = CountsCache(settings.TOTAL_COUNTS_TTL, max_entries=1024)
+
+
+async def count_total(
+    session: AsyncSession, crud: CRUDBase, query: Select
+) -> tuple[int, bool]:
+    """Возвращает общее количество строк списка для пагинации.
+
+    Сначала берется оценка планировщика: если она больше
+    `COUNT_EXACT_LIMIT`, точный подсчет был бы сопоставим по стоимости с
+    самой выборкой, и возвращается оценка. Иначе строки считаются
+    отдельным запросом без загрузки связей, а результат кэшируется по
+    тексту и параметрам запроса.
+
+    Закэшированное количество возвращается как неточное: кэш сбрасывается
+    только при записи в этом процессе, и изменения из других процессов
+    становятся видны лишь по истечении `TOTAL_COUNTS_TTL`.
+
+    Args:
+        session: Асинхронная сессия БД.
+        crud: CRUD модели, к которой относится запрос.
+        query: Запрос выборки без загрузки связей и пагинации.
+
+    Returns:
+        Пара (количество, точное ли оно).
+    """
+    compiled = query.compile(dialect=postgresql.dialect())
+    key = (compiled.string, repr(compiled.params))
+    cached = total_counts.get(key)
+    if cached is not None:
+        return cached, False
+    estimate = await crud.estimate_count(session, query)
+    if estimate > settings.COUNT_EXACT_LIMIT:
+        return estimate, False
+    total = await crud.count(session, query)
+    total_counts.put(key, total)
+    return total, True
+
+
+# Ключ `session.info`: в сессии сбрасывались объекты, влияющие на подсчеты.
+_COUNTS_CHANGED = "counts_changed"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_counts_changed(session: Session, flush_context) -> None:
+    """Отмечает сессию, если в ней менялись связанные с подсчетом объекты.
+
+    Кэши сбрасываются только после фиксации транзакции: сброс при flush
+    позволил бы параллельному запросу до коммита снова закэшировать
+    старое количество.
+    """
+    tracked = (Organization, Building, Activity)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, tracked):
+            session.info[_COUNTS_CHANGED] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_counts(session: Session) -> None:
+    """Сбрасывает кэши после фиксации изменений, отмеченных при flush."""
+    if session.info.pop(_COUNTS_CHANGED, False):
+        facet_counts.clear()
+        total_counts.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_counts_changed(session: Session) -> None:
+    """Снимает отметку об изменениях отмененной транзакции."""
+    session.info.pop(_COUNTS_CHANGED, None)
@@ -1,12 +1,89 @@
+import json
 from typing import Generic, TypeVar, Any, Sequence
 
-from sqlalchemy import select, delete
+from sqlalchemy import (
+    select,
+    delete,
+    tuple_,
+    func,
+    any_,
+    literal,
+    ColumnElement,
+    Integer,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 ModelType = TypeVar("ModelType")
 
 
+def in_ids(column: Any, ids: Sequence[int]) -> ColumnElement[bool]:
+    """Строит условие `column = ANY(:ids)` с одним параметром-массивом.
+
+    В отличие от `IN (...)` не раздувает запрос и не упирается в лимит
+    количества параметров asyncpg на больших списках.
+
+    Args:
+        column: Целочисленная колонка.
+        ids: Список идентификаторов.
+
+    Returns:
+        SQL-условие.
+    """
+    return column == any_(literal(list(ids), ARRAY(Integer)))
+
+
+def in_int_pairs(
+    first: Any, second: Any, pairs: Sequence[tuple[int, int]]
+) -> ColumnElement[bool]:
+    """Строит условие `(first, second) IN (SELECT * FROM unnest(...))`.
+
+    Пары передаются двумя параметрами-массивами, поэтому, как и в
+    `in_ids`, количество параметров не зависит от длины списка.
+
+    Args:
+        first: Выражение первого элемента пары.
+        second: Выражение второго элемента пары.
+        pairs: Список целочисленных пар.
+
+    Returns:
+        SQL-условие.
+    """
+    values = func.unnest(
+        literal([a for a, _ in pairs], ARRAY(Integer)),
+        literal([b for _, b in pairs], ARRAY(Integer)),
+    ).table_valued("first", "second")
+    return tuple_(first, second).in_(select(values.c.first, values.c.second))
+
+
+class Explain(Executable, ClauseElement):
+    """Оператор `EXPLAIN (FORMAT JSON)` для запроса без его выполнения.
+
+    Attributes:
+        stmt: Объясняемый запрос.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select) -> None:
+        """Создает оператор.
+
+        Args:
+            stmt: Объясняемый запрос.
+        """
+        self.stmt = stmt
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    """Компилирует EXPLAIN с параметрами исходного запроса."""
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
 class CRUDBase(Generic[ModelType]):
     """Базовый асинхронный CRUD для моделей SQLAlchemy.
 
@@ -40,27 +117,75 @@ class CRUDBase(Generic[ModelType]):
         self,
         session: AsyncSession,
         skip: int = 0,
-        limit: int = 100,
+        limit: int | None = 100,
         order_by: InstrumentedAttribute | None = None,
+        after_id: Any | None = None,
     ) -> Sequence[ModelType]:
         """Возвращает коллекцию объектов с пагинацией.
 
         Args:
             session: Асинхронная сессия БД.
             skip: Смещение.
-            limit: Лимит записей.
+            limit: Лимит записей, None — без ограничения.
             order_by: Поле сортировки.
+            after_id: Если задано, только объекты с большим id; применяется
+                при сортировке по id (keyset-пагинация).
 
         Returns:
             Последовательность ORM-объектов.
         """
         stmt = select(self.model)
+        if after_id is not None:
+            stmt = stmt.where(getattr(self.model, "id") > after_id)
         if order_by is not None:
             stmt = stmt.order_by(order_by)
         stmt = stmt.offset(skip).limit(limit)
         res = await session.execute(stmt)
         return list(res.scalars().all())
 
+    def _ids_query(self, query: Select) -> Select:
+        """Оставляет в запросе выборки только id, сохраняя FROM и условия."""
+        return query.with_only_columns(
+            getattr(self.model, "id"), maintain_column_froms=True
+        ).order_by(None)
+
+    async def count(self, session: AsyncSession, query: Select) -> int:
+        """Считает строки запроса выборки без загрузки объектов.
+
+        Args:
+            session: Асинхронная сессия БД.
+            query: Запрос выборки без пагинации.
+
+        Returns:
+            Количество строк.
+        """
+        stmt = select(func.count()).select_from(
+            self._ids_query(query).subquery()
+        )
+        res = await session.execute(stmt)
+        return res.scalar_one()
+
+    async def estimate_count(
+        self, session: AsyncSession, query: Select
+    ) -> int:
+        """Возвращает оценку количества строк запроса по плану Postgres.
+
+        Запрос не выполняется: оценка берется из `Plan Rows` корневого
+        узла плана и опирается на статистику таблиц.
+
+        Args:
+            session: Асинхронная сессия БД.
+            query: Запрос выборки без пагинации.
+
+        Returns:
+            Оценка количества строк.
+        """
+        res = await session.execute(Explain(self._ids_query(query)))
+        plan = res.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def create(
         self, session: AsyncSession, obj_in: dict[str, Any]
     ) -> ModelType:
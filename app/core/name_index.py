@@ -0,0 +1,188 @@
+import asyncio
+from typing import Sequence
+
+from sqlalchemy import Row, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from app.config import settings
+from app.core.cache import VersionedCache
+from app.crud.crud_organization import organization_crud
+from app.models.organization import Organization
+from app.utils.text_index import FuzzyIndex, NGramIndex, PrefixIndex
+
+
+class NameIndex(VersionedCache):
+    """In-process индекс названий организаций.
+
+    Используется для автодополнения по началу слов, нечеткого поиска и
+    поиска по подстроке, когда в БД нет триграммного индекса pg_trgm.
+    Каждая часть индекса строится при первом обращении к ней через
+    `get_ngrams`, `get_prefixes` или `get_fuzzy`; изменения организаций из
+    журнала применяются только к уже построенным частям.
+
+    Attributes:
+        ngrams: Инвертированный индекс триграмм названий или None, если он
+            еще не построен.
+        prefixes: Отсортированный индекс начал слов названий или None.
+        fuzzy: Индекс слов названий для поиска с опечатками или None.
+    """
+
+    def __init__(self) -> None:
+        """Создает индекс без построенных частей."""
+        super().__init__(organization_crud)
+        self.ngrams: NGramIndex | None = None
+        self.prefixes: PrefixIndex | None = None
+        self.fuzzy: FuzzyIndex | None = None
+        self._trigram_available: bool | None = None
+
+    def _parts(self) -> list[NGramIndex | PrefixIndex | FuzzyIndex]:
+        return [
+            part
+            for part in (self.ngrams, self.prefixes, self.fuzzy)
+            if part is not None
+        ]
+
+    async def get_ngrams(self, session: AsyncSession) -> NGramIndex:
+        """Возвращает индекс триграмм, строя его при первом обращении.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            Индекс триграмм названий.
+        """
+        await self.ensure_fresh(session)
+        if self.ngrams is None:
+            async with self._lock:
+                if self.ngrams is None:
+                    rows = await organization_crud.names(session)
+                    self.ngrams = await asyncio.to_thread(
+                        self._build_ngrams, rows
+                    )
+        return self.ngrams
+
+    async def get_prefixes(self, session: AsyncSession) -> PrefixIndex:
+        """Возвращает индекс начал слов, строя его при первом обращении.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            Индекс начал слов названий.
+        """
+        await self.ensure_fresh(session)
+        if self.prefixes is None:
+            async with self._lock:
+                if self.prefixes is None:
+                    rows = await organization_crud.names(session)
+                    self.prefixes = await asyncio.to_thread(
+                        PrefixIndex.build, rows
+                    )
+        return self.prefixes
+
+    async def get_fuzzy(self, session: AsyncSession) -> FuzzyIndex:
+        """Возвращает индекс нечеткого поиска, строя его при первом обращении.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            Индекс слов названий.
+        """
+        await self.ensure_fresh(session)
+        if self.fuzzy is None:
+            async with self._lock:
+                if self.fuzzy is None:
+                    rows = await organization_crud.names(session)
+                    self.fuzzy = await asyncio.to_thread(
+                        self._build_fuzzy, rows
+                    )
+        return self.fuzzy
+
+    @staticmethod
+    def _build_ngrams(rows: Sequence[Row[tuple[int, str]]]) -> NGramIndex:
+        ngrams = NGramIndex()
+        for id_, name in rows:
+            ngrams.add(id_, name)
+        return ngrams
+
+    @staticmethod
+    def _build_fuzzy(rows: Sequence[Row[tuple[int, str]]]) -> FuzzyIndex:
+        fuzzy = FuzzyIndex(settings.FUZZY_MAX_DISTANCE)
+        for id_, name in rows:
+            fuzzy.add(id_, name)
+        return fuzzy
+
+    async def _reload(self, session: AsyncSession) -> None:
+        if not self._parts():
+            return
+        rows = await organization_crud.names(session)
+        ngrams, prefixes, fuzzy = await asyncio.to_thread(
+            self._build, rows, self.ngrams, self.prefixes, self.fuzzy
+        )
+        self.ngrams, self.prefixes, self.fuzzy = ngrams, prefixes, fuzzy
+
+    @classmethod
+    def _build(
+        cls,
+        rows: Sequence[Row[tuple[int, str]]],
+        ngrams: NGramIndex | None,
+        prefixes: PrefixIndex | None,
+        fuzzy: FuzzyIndex | None,
+    ) -> tuple[NGramIndex | None, PrefixIndex | None, FuzzyIndex | None]:
+        """Заново строит те части индекса, которые уже были построены."""
+        return (
+            None if ngrams is None else cls._build_ngrams(rows),
+            None if prefixes is None else PrefixIndex.build(rows),
+            None if fuzzy is None else cls._build_fuzzy(rows),
+        )
+
+    async def _update(self, session: AsyncSession, ids: Sequence[int]) -> None:
+        parts = self._parts()
+        if not parts:
+            return
+        rows = await organization_crud.names(session, ids=ids)
+        for id_ in set(ids).difference(row[0] for row in rows):
+            for part in parts:
+                part.remove(id_)
+        for id_, name in rows:
+            for part in parts:
+                part.add(id_, name)
+
+    def _size(self) -> int:
+        parts = self._parts()
+        return len(parts[0]) if parts else 0
+
+    async def use_memory(self, session: AsyncSession) -> bool:
+        """Определяет, выполнять ли поиск по подстроке в памяти.
+
+        При `NAME_SEARCH_BACKEND=auto` наличие триграммного индекса в БД
+        проверяется один раз.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            True, если поиск нужно выполнять по in-process индексу.
+        """
+        if settings.NAME_SEARCH_BACKEND != "auto":
+            return settings.NAME_SEARCH_BACKEND == "memory"
+        if self._trigram_available is None:
+            self._trigram_available = (
+                await organization_crud.has_trigram_index(session)
+            )
+        return not self._trigram_available
+
+
+name_index = NameIndex()
+
+
+@event.listens_for(Organization, "after_insert")
+@event.listens_for(Organization, "after_update")
+@event.listens_for(Organization, "after_delete")
+def _track_organization_change(
+    mapper, connection, target: Organization
+) -> None:
+    """Передает индексу названий организацию, измененную через ORM."""
+    name_index.mark_changed(object_session(target), target.id)
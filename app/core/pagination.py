@@ -0,0 +1,153 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+
+T = TypeVar("T")
+
+CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_HEADER = "X-Total-Count"
+TOTAL_EXACT_HEADER = "X-Total-Count-Exact"
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    """Страница выборки с курсором на следующую страницу.
+
+    Attributes:
+        items: Объекты страницы.
+        next_cursor: Курсор следующей страницы или None, если страница
+            последняя.
+        total: Общее количество строк выборки или None, если оно не
+            запрашивалось.
+        total_exact: False, если `total` — оценка планировщика или значение
+            из кэша.
+    """
+
+    items: list[T]
+    next_cursor: str | None = None
+    total: int | None = None
+    total_exact: bool = True
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Кодирует ключ сортировки последней строки в непрозрачный курсор.
+
+    Args:
+        key: Значения ключа сортировки, последним — идентификатор.
+
+    Returns:
+        Курсор в base64url без выравнивания.
+    """
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Декодирует курсор и проверяет форму ключа.
+
+    Args:
+        cursor: Курсор из запроса.
+        size: Ожидаемое количество значений ключа.
+
+    Returns:
+        Значения ключа сортировки; последнее — целый идентификатор.
+
+    Raises:
+        HTTPException: Если курсор поврежден или относится к другой
+            сортировке.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        key = None
+    if (
+        not isinstance(key, list)
+        or len(key) != size
+        or not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool)
+            for v in key
+        )
+        or not isinstance(key[-1], int)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        )
+    return key
+
+
+def make_page(
+    items: Sequence[T], limit: int, key: Sequence[Any] | None
+) -> Page[T]:
+    """Собирает страницу; курсор выдается, только если страница полная.
+
+    Args:
+        items: Объекты страницы.
+        limit: Запрошенный лимит.
+        key: Ключ сортировки последнего объекта.
+
+    Returns:
+        Страница выборки.
+    """
+    items = list(items)
+    if len(items) < limit or not items or key is None:
+        return Page(items)
+    return Page(items, encode_cursor(key))
+
+
+def empty_page(with_total: bool = False) -> Page:
+    """Возвращает пустую страницу.
+
+    Args:
+        with_total: Указывать ли нулевое общее количество.
+
+    Returns:
+        Страница без объектов.
+    """
+    return Page([], total=0 if with_total else None)
+
+
+def set_page_headers(response: Response, page: Page) -> None:
+    """Передает курсор следующей страницы и общее количество в заголовках.
+
+    Args:
+        response: Ответ FastAPI.
+        page: Страница выборки.
+    """
+    if page.next_cursor is not None:
+        response.headers[CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_HEADER] = str(page.total)
+        response.headers[TOTAL_EXACT_HEADER] = (
+            "true" if page.total_exact else "false"
+        )
+
+
+def cursor_after_id(cursor: str | None) -> int | None:
+    """Возвращает последний id из курсора выборки, упорядоченной по id.
+
+    Args:
+        cursor: Курсор из запроса или None.
+
+    Returns:
+        Идентификатор или None, если курсор не задан.
+    """
+    return None if cursor is None else decode_cursor(cursor, 1)[0]
+
+
+def page_by_id(items: Sequence[T], limit: int) -> Page[T]:
+    """Собирает страницу выборки, упорядоченной по id.
+
+    Args:
+        items: Объекты страницы с атрибутом `id`.
+        limit: Запрошенный лимит.
+
+    Returns:
+        Страница выборки.
+    """
+    return make_page(items, limit, [items[-1].id] if items else None)
@@ -1,14 +1,202 @@
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, update, func, and_, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.core.crud_base import CRUDBase
+from app.crud.crud_building import area_clause
 from app.models.activity import Activity
+from app.models.building import Building
+from app.models.organization import Organization, organization_activities
+
+PATH_SEPARATOR = "."
+# Больше любого символа пути (цифры и разделитель) в порядке collation "C".
+PATH_UPPER_BOUND = "~"
+MAX_LEVEL = 3
+
+
+def subtree_clause(activity_id: int) -> ColumnElement[bool]:
+    """Строит условие принадлежности Activity поддереву вида деятельности.
+
+    Путь корня берется подзапросом, а префиксное сравнение записано как
+    диапазон, чтобы Postgres использовал индекс `ix_activity_path`.
+
+    Args:
+        activity_id: Идентификатор корня поддерева.
+
+    Returns:
+        SQL-условие по колонкам Activity.
+    """
+    root = aliased(Activity)
+    root_path = (
+        select(root.path).where(root.id == activity_id).scalar_subquery()
+    )
+    return and_(
+        Activity.path >= root_path,
+        Activity.path < root_path.concat(PATH_UPPER_BOUND),
+    )
+
+
+def path_depth(path: ColumnElement[str]) -> ColumnElement[int]:
+    """Строит выражение глубины материализованного пути.
+
+    Args:
+        path: Выражение пути вида "1.2.".
+
+    Returns:
+        Количество узлов в пути, то есть уровень вида деятельности.
+    """
+    return func.length(path) - func.length(
+        func.replace(path, PATH_SEPARATOR, "")
+    )
 
 
 class CRUDActivity(CRUDBase[Activity]):
-    """CRUD для видов деятельности."""
+    """CRUD для видов деятельности.
+
+    Поддерживает материализованный путь `Activity.path` при создании и
+    переносе видов деятельности.
+    """
+
+    async def _parent_path(
+        self, session: AsyncSession, parent_id: int | None
+    ) -> str:
+        """Возвращает путь родителя или пустую строку для корня."""
+        if parent_id is None:
+            return ""
+        res = await session.execute(
+            select(Activity.path).where(Activity.id == parent_id)
+        )
+        path = res.scalar_one_or_none()
+        if path is None:
+            raise ValueError("Parent activity not found")
+        return path
+
+    async def create(
+        self, session: AsyncSession, obj_in: dict[str, Any]
+    ) -> Activity:
+        """Создает вид деятельности и заполняет его путь.
+
+        Args:
+            session: Асинхронная сессия БД.
+            obj_in: Данные для вставки.
+
+        Returns:
+            Созданный вид деятельности.
+
+        Raises:
+            ValueError: Если родитель не найден.
+        """
+        prefix = await self._parent_path(session, obj_in.get("parent_id"))
+        obj = Activity(**obj_in, path=prefix)
+        session.add(obj)
+        await session.flush()
+        obj.path = f"{prefix}{obj.id}{PATH_SEPARATOR}"
+        await session.flush()
+        await session.refresh(obj)
+        return obj
+
+    async def update(
+        self, session: AsyncSession, db_obj: Activity, obj_in: dict[str, Any]
+    ) -> Activity:
+        """Обновляет вид деятельности и переносит пути поддерева при смене родителя.
+
+        При переносе пути и уровни всего поддерева пересчитываются одним
+        UPDATE; уровень узла определяется новым родителем, а не `obj_in`.
+
+        Args:
+            session: Асинхронная сессия БД.
+            db_obj: Текущий вид деятельности.
+            obj_in: Данные для обновления.
+
+        Returns:
+            Обновленный вид деятельности.
+
+        Raises:
+            ValueError: Если родитель не найден, узел переносится в свое
+                поддерево или поддерево стало бы глубже `MAX_LEVEL`.
+        """
+        if "parent_id" in obj_in and obj_in["parent_id"] != db_obj.parent_id:
+            prefix = await self._parent_path(session, obj_in["parent_id"])
+            old_path = db_obj.path
+            new_path = f"{prefix}{db_obj.id}{PATH_SEPARATOR}"
+            if prefix.startswith(old_path):
+                raise ValueError("Activity cannot be moved into its subtree")
+            in_subtree = (
+                Activity.path >= old_path,
+                Activity.path < old_path + PATH_UPPER_BOUND,
+            )
+            shift = new_path.count(PATH_SEPARATOR) - old_path.count(
+                PATH_SEPARATOR
+            )
+            res = await session.execute(
+                select(func.max(path_depth(Activity.path))).where(*in_subtree)
+            )
+            if (res.scalar_one() or 0) + shift > MAX_LEVEL:
+                raise ValueError(
+                    f"Activity hierarchy cannot be deeper than {MAX_LEVEL}"
+                )
+            moved_path = func.concat(
+                new_path, func.substr(Activity.path, len(old_path) + 1)
+            )
+            await session.execute(
+                update(Activity)
+                .where(*in_subtree)
+                .values(path=moved_path, level=path_depth(moved_path))
+                .execution_options(synchronize_session=False)
+            )
+            db_obj.path = new_path
+            obj_in = {**obj_in, "level": new_path.count(PATH_SEPARATOR)}
+        return await super().update(session, db_obj, obj_in)
+
+    async def organization_counts(
+        self,
+        session: AsyncSession,
+        bbox: tuple[float, float, float, float] | None = None,
+        building_id: int | None = None,
+    ) -> dict[int, int]:
+        """Считает организации в поддереве каждого вида деятельности.
+
+        Один агрегирующий запрос: каждый вид деятельности соединяется со
+        своим поддеревом по материализованному пути, затем со связями
+        организаций; организация с несколькими видами из одного поддерева
+        считается один раз.
+
+        Args:
+            session: Асинхронная сессия БД.
+            bbox: Необязательная область (lat_min, lon_min, lat_max, lon_max).
+            building_id: Необязательный идентификатор здания.
+
+        Returns:
+            Словарь activity_id -> количество организаций; виды деятельности
+            без организаций отсутствуют.
+        """
+        root = aliased(Activity)
+        oa = organization_activities
+        stmt = (
+            select(root.id, func.count(oa.c.organization_id.distinct()))
+            .join(
+                Activity,
+                and_(
+                    Activity.path >= root.path,
+                    Activity.path < root.path.concat(PATH_UPPER_BOUND),
+                ),
+            )
+            .join(oa, oa.c.activity_id == Activity.id)
+            .group_by(root.id)
+        )
+        if bbox is not None or building_id is not None:
+            stmt = stmt.join(
+                Organization, Organization.id == oa.c.organization_id
+            )
+        if building_id is not None:
+            stmt = stmt.where(Organization.building_id == building_id)
+        if bbox is not None:
+            stmt = stmt.join(Building, Building.id == Organization.building_id)
+            stmt = stmt.where(area_clause(*bbox))
+        res = await session.execute(stmt)
+        return dict(res.tuples().all())
 
     async def get_children(
         self, session: AsyncSession, parent_id: int
@@ -1,17 +1,56 @@
+from decimal import Decimal
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, and_, or_, Row, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.crud_base import CRUDBase
+from app.core.crud_base import CRUDBase, in_ids
 from app.models.building import Building
+from app.utils.geohash import prefix_ranges
+
+
+def area_clause(
+    lat1: float, lon1: float, lat2: float, lon2: float
+) -> ColumnElement[bool]:
+    """Строит условие попадания здания в прямоугольную область.
+
+    Область переводится в небольшой набор диапазонов geohash, которые
+    Postgres обрабатывает range-сканами по `ix_building_geohash`; точные
+    границы проверяются условиями по координатам.
+
+    Args:
+        lat1: Нижняя широта.
+        lon1: Левая долгота.
+        lat2: Верхняя широта.
+        lon2: Правая долгота.
+
+    Returns:
+        SQL-условие по колонкам Building.
+    """
+    ranges = [
+        (
+            Building.geohash >= lo
+            if hi is None
+            else and_(Building.geohash >= lo, Building.geohash < hi)
+        )
+        for lo, hi in prefix_ranges(lat1, lon1, lat2, lon2)
+    ]
+    return and_(
+        or_(*ranges),
+        Building.latitude.between(lat1, lat2),
+        Building.longitude.between(lon1, lon2),
+    )
 
 
 class CRUDBuilding(CRUDBase[Building]):
     """CRUD для зданий."""
 
     async def list(
-        self, session: AsyncSession, skip: int, limit: int
+        self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        after_id: int | None = None,
     ) -> Sequence[Building]:
         """Возвращает список зданий с пагинацией.
 
@@ -19,13 +58,83 @@ class CRUDBuilding(CRUDBase[Building]):
             session: Асинхронная сессия БД.
             skip: Смещение.
             limit: Количество записей.
+            after_id: Если задано, только здания с большим id
+                (keyset-пагинация).
 
         Returns:
             Последовательность зданий.
         """
-        stmt = select(Building).order_by(Building.id).offset(skip).limit(limit)
+        return await self.get_multi(
+            session,
+            skip=skip,
+            limit=limit,
+            order_by=Building.id,
+            after_id=after_id,
+        )
+
+    async def coordinates(
+        self, session: AsyncSession, ids: Sequence[int] | None = None
+    ) -> Sequence[Row[tuple[int, Decimal, Decimal]]]:
+        """Возвращает координаты зданий без загрузки ORM-объектов.
+
+        Args:
+            session: Асинхронная сессия БД.
+            ids: Если задано, только здания с этими идентификаторами.
+
+        Returns:
+            Строки (id, latitude, longitude).
+        """
+        stmt = select(Building.id, Building.latitude, Building.longitude)
+        if ids is not None:
+            stmt = stmt.where(in_ids(Building.id, ids))
+        res = await session.execute(stmt)
+        return list(res.all())
+
+    async def coordinates_in_area(
+        self,
+        session: AsyncSession,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float,
+    ) -> Sequence[Row[tuple[int, Decimal, Decimal]]]:
+        """Возвращает координаты зданий внутри прямоугольной области.
+
+        Args:
+            session: Асинхронная сессия БД.
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+
+        Returns:
+            Строки (id, latitude, longitude).
+        """
+        stmt = select(
+            Building.id, Building.latitude, Building.longitude
+        ).where(area_clause(lat1, lon1, lat2, lon2))
+        res = await session.execute(stmt)
+        return list(res.all())
+
+    async def coordinates_in_areas(
+        self,
+        session: AsyncSession,
+        areas: Sequence[tuple[float, float, float, float]],
+    ) -> Sequence[Row[tuple[int, Decimal, Decimal]]]:
+        """Возвращает координаты зданий, попавших хотя бы в одну из областей.
+
+        Args:
+            session: Асинхронная сессия БД.
+            areas: Прямоугольники (lat_min, lon_min, lat_max, lon_max).
+
+        Returns:
+            Строки (id, latitude, longitude).
+        """
+        stmt = select(
+            Building.id, Building.latitude, Building.longitude
+        ).where(or_(*(area_clause(*a) for a in areas)))
         res = await session.execute(stmt)
-        return list(res.scalars().all())
+        return list(res.all())
 
 
 building_crud = CRUDBuilding(Building)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from typing import Sequence
+
+from sqlalchemy import BigInteger, String, select, delete, func, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crud_base import CRUDBase
+from app.models.cache_change import CacheChange
+
+
+class CRUDCacheChange(CRUDBase[CacheChange]):
+    """CRUD для журнала изменений закэшированных таблиц."""
+
+    async def cursor(self, session: AsyncSession) -> int:
+        """Возвращает xmin текущего снимка БД.
+
+        Все транзакции с меньшими номерами к моменту снимка завершены, поэтому
+        их изменения видны любому следующему запросу.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            Номер транзакции.
+        """
+        xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+        res = await session.execute(
+            select(cast(cast(xmin, String), BigInteger))
+        )
+        return res.scalar_one()
+
+    async def changed_ids(
+        self,
+        session: AsyncSession,
+        table_name: str,
+        since_xid: int,
+        limit: int,
+    ) -> Sequence[int]:
+        """Возвращает строки таблицы, измененные начиная с курсора.
+
+        Args:
+            session: Асинхронная сессия БД.
+            table_name: Имя таблицы.
+            since_xid: Курсор, полученный `cursor`.
+            limit: Максимальное количество идентификаторов.
+
+        Returns:
+            Идентификаторы строк без повторов.
+        """
+        stmt = (
+            select(CacheChange.row_id)
+            .where(
+                CacheChange.table_name == table_name,
+                CacheChange.xid >= since_xid,
+            )
+            .distinct()
+            .limit(limit)
+        )
+        res = await session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def prune(
+        self, session: AsyncSession, older_than: timedelta
+    ) -> None:
+        """Удаляет записи журнала старше заданного возраста.
+
+        Args:
+            session: Асинхронная сессия БД.
+            older_than: Возраст записи.
+        """
+        stmt = delete(CacheChange).where(
+            CacheChange.created_at < func.now() - older_than
+        )
+        await session.execute(stmt)
+
+
+cache_change_crud = CRUDCacheChange(CacheChange)
@@ -1,21 +1,457 @@
-from typing import Sequence
+from math import cos, radians
+from typing import AsyncIterator, Collection, Sequence
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import (
+    select,
+    and_,
+    or_,
+    func,
+    null,
+    Float,
+    Integer,
+    cast,
+    tuple_,
+    exists,
+    text,
+    ColumnElement,
+    Row,
+    Select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
-from app.core.crud_base import CRUDBase
+from app.core.crud_base import CRUDBase, in_ids, in_int_pairs
+from app.crud.crud_activity import subtree_clause
+from app.crud.crud_building import area_clause
 from app.models.activity import Activity
 from app.models.building import Building
-from app.models.organization import Organization
+from app.models.organization import (
+    Organization,
+    OrganizationPhone,
+    organization_activities,
+)
+from app.models.read import (
+    ORGANIZATION_RELATIONS,
+    ActivityRead,
+    BuildingRead,
+    OrganizationRead,
+)
+from app.utils.geo import EARTH_RADIUS_M
+
+TRIGRAM_INDEX_NAME = "ix_organization_name_trgm"
+FULLTEXT_CONFIG = "russian"
+
+
+def name_contains_clause(name: str) -> ColumnElement[bool]:
+    """Строит условие вхождения фрагмента в название без учета регистра.
+
+    Спецсимволы LIKE во фрагменте экранируются, выражение `lower(name)`
+    совпадает с выражением триграммного индекса.
+
+    Args:
+        name: Фрагмент названия.
+
+    Returns:
+        SQL-условие по колонкам Organization.
+    """
+    escaped = (
+        name.lower()
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+    return func.lower(Organization.name).like(f"%{escaped}%", escape="\\")
+
+
+def in_activity_subtree_clause(activity_id: int) -> ColumnElement[bool]:
+    """Строит условие наличия у организации вида деятельности из поддерева.
+
+    Args:
+        activity_id: Идентификатор корня поддерева.
+
+    Returns:
+        SQL-условие EXISTS по колонкам Organization.
+    """
+    return exists().where(
+        organization_activities.c.organization_id == Organization.id,
+        organization_activities.c.activity_id == Activity.id,
+        subtree_clause(activity_id),
+    )
+
+
+def cell_key_expr(
+    cell_deg: float,
+) -> tuple[ColumnElement[int], ColumnElement[int]]:
+    """Строит выражения номера ячейки сетки кластеризации для здания.
+
+    Args:
+        cell_deg: Размер ячейки в градусах.
+
+    Returns:
+        Пара выражений (номер по широте, номер по долготе).
+    """
+    return (
+        cast(func.floor(Building.latitude / cell_deg), Integer),
+        cast(func.floor(Building.longitude / cell_deg), Integer),
+    )
+
+
+def distance_m_expr(lat: float, lon: float) -> ColumnElement[float]:
+    """Строит SQL-выражение расстояния от точки до здания по формуле Хаверсина.
+
+    Тригонометрия центра вычисляется на стороне Python, в запрос попадают
+    только константы. Аргумент asin ограничен единицей, чтобы ошибки
+    округления не приводили к ошибке домена в Postgres.
+
+    Args:
+        lat: Широта центра в градусах.
+        lon: Долгота центра в градусах.
+
+    Returns:
+        Выражение расстояния в метрах.
+    """
+    b_lat = func.radians(cast(Building.latitude, Float))
+    b_lon = func.radians(cast(Building.longitude, Float))
+    sin_d_lat = func.sin((b_lat - radians(lat)) / 2.0)
+    sin_d_lon = func.sin((b_lon - radians(lon)) / 2.0)
+    a = func.power(sin_d_lat, 2) + cos(radians(lat)) * func.cos(
+        b_lat
+    ) * func.power(sin_d_lon, 2)
+    return 2 * EARTH_RADIUS_M * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+READ_COLUMNS = (
+    Organization.id,
+    Organization.name,
+    Organization.building_id,
+    Building.address,
+    Building.latitude,
+    Building.longitude,
+)
+
+
+def organization_select() -> Select[tuple[Organization]]:
+    """Начинает запрос организаций, соединенный со зданиями.
+
+    Колонки здания нужны каждому ответу списка, поэтому соединение есть во
+    всех запросах выборки и чтение обходится без отдельной загрузки зданий.
+
+    Returns:
+        Запрос выборки.
+    """
+    return select(Organization).join(Organization.building)
 
 
 class CRUDOrganization(CRUDBase[Organization]):
-    """CRUD для организаций."""
+    """CRUD для организаций.
+
+    Методы `*_query` строят запрос выборки только с условиями, без
+    загрузки связей, сортировки и пагинации; по ним же считаются общие
+    количества строк списков. Списки читаются проекцией колонок ответа в
+    `OrganizationRead`, минуя ORM-сущности и identity map.
+    """
+
+    def _read_query(self, query: Select) -> Select:
+        """Заменяет колонки запроса выборки колонками ответа `READ_COLUMNS`."""
+        return query.with_only_columns(
+            *READ_COLUMNS, maintain_column_froms=True
+        )
+
+    async def _assemble(
+        self,
+        session: AsyncSession,
+        rows: Sequence[Row],
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[OrganizationRead]:
+        """Собирает модели чтения из строк, начинающихся с `READ_COLUMNS`.
+
+        Телефоны и виды деятельности всех организаций догружаются
+        отдельными запросами по их идентификаторам, только если указаны в
+        `include`; без них выборка обходится одним запросом. Одинаковые
+        здания представлены одним объектом.
+
+        Args:
+            session: Асинхронная сессия БД.
+            rows: Строки выборки; колонки после `READ_COLUMNS` игнорируются.
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Организации в порядке строк.
+        """
+        buildings: dict[int, BuildingRead] = {}
+        result: list[OrganizationRead] = []
+        for id_, name, building_id, address, lat, lon, *_ in rows:
+            building = buildings.get(building_id)
+            if building is None:
+                building = BuildingRead(building_id, address, lat, lon)
+                buildings[building_id] = building
+            result.append(OrganizationRead(id_, name, building_id, building))
+        if not result:
+            return result
+
+        by_id = {o.id: o for o in result}
+        ids = list(by_id)
+        if "phones" in include:
+            await self._load_phones(session, by_id, ids)
+        if "activities" in include:
+            await self._load_activities(session, by_id, ids)
+        return result
+
+    async def _load_phones(
+        self,
+        session: AsyncSession,
+        by_id: dict[int, OrganizationRead],
+        ids: list[int],
+    ) -> None:
+        """Догружает телефоны организаций одним запросом."""
+        phones = await session.execute(
+            select(
+                OrganizationPhone.organization_id,
+                OrganizationPhone.phone_number,
+            )
+            .where(in_ids(OrganizationPhone.organization_id, ids))
+            .order_by(OrganizationPhone.id)
+        )
+        for org_id, number in phones.tuples():
+            by_id[org_id].phones.append(number)
+
+    async def _load_activities(
+        self,
+        session: AsyncSession,
+        by_id: dict[int, OrganizationRead],
+        ids: list[int],
+    ) -> None:
+        """Догружает виды деятельности организаций одним запросом.
+
+        Одинаковые виды деятельности представлены одним объектом.
+        """
+        links = await session.execute(
+            select(
+                organization_activities.c.organization_id,
+                Activity.id,
+                Activity.name,
+                Activity.parent_id,
+                Activity.level,
+            )
+            .join(
+                Activity, Activity.id == organization_activities.c.activity_id
+            )
+            .where(in_ids(organization_activities.c.organization_id, ids))
+            .order_by(Activity.id)
+        )
+        activities: dict[int, ActivityRead] = {}
+        for org_id, act_id, act_name, parent_id, level in links.tuples():
+            activity = activities.get(act_id)
+            if activity is None:
+                activity = ActivityRead(act_id, act_name, parent_id, level)
+                activities[act_id] = activity
+            by_id[org_id].activities.append(activity)
+
+    async def _page(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Organization]],
+        skip: int,
+        limit: int | None,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[OrganizationRead]:
+        """Читает страницу запроса по возрастанию id.
+
+        Args:
+            session: Асинхронная сессия БД.
+            query: Запрос выборки из `*_query`.
+            skip: Смещение.
+            limit: Количество записей, None — без ограничения.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Организации страницы.
+        """
+        stmt = (
+            self._read_query(query)
+            .order_by(Organization.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
+        res = await session.execute(stmt)
+        return await self._assemble(session, res.all(), include=include)
+
+    def building_query(self, building_id: int) -> Select[tuple[Organization]]:
+        """Строит запрос организаций здания.
+
+        Args:
+            building_id: Идентификатор здания.
+
+        Returns:
+            Запрос выборки.
+        """
+        return organization_select().where(
+            Organization.building_id == building_id
+        )
+
+    def buildings_query(
+        self, building_ids: Sequence[int]
+    ) -> Select[tuple[Organization]]:
+        """Строит запрос организаций из набора зданий.
+
+        Args:
+            building_ids: Идентификаторы зданий.
+
+        Returns:
+            Запрос выборки.
+        """
+        return organization_select().where(
+            in_ids(Organization.building_id, building_ids)
+        )
+
+    def activity_query(self, activity_id: int) -> Select[tuple[Organization]]:
+        """Строит запрос организаций с видом деятельности.
+
+        Args:
+            activity_id: Идентификатор вида деятельности.
+
+        Returns:
+            Запрос выборки.
+        """
+        return (
+            organization_select()
+            .join(Organization.activities)
+            .where(Activity.id == activity_id)
+        )
+
+    def activity_subtree_query(
+        self, activity_id: int
+    ) -> Select[tuple[Organization]]:
+        """Строит запрос организаций из поддерева вида деятельности.
+
+        Args:
+            activity_id: Идентификатор корня поддерева.
+
+        Returns:
+            Запрос выборки.
+        """
+        return organization_select().where(
+            in_activity_subtree_clause(activity_id)
+        )
+
+    def area_query(
+        self, lat1: float, lon1: float, lat2: float, lon2: float
+    ) -> Select[tuple[Organization]]:
+        """Строит запрос организаций в прямоугольной области.
+
+        Args:
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+
+        Returns:
+            Запрос выборки.
+        """
+        return organization_select().where(area_clause(lat1, lon1, lat2, lon2))
+
+    def name_query(self, name: str) -> Select[tuple[Organization]]:
+        """Строит запрос организаций по фрагменту названия.
+
+        Args:
+            name: Фрагмент названия.
+
+        Returns:
+            Запрос выборки.
+        """
+        return organization_select().where(name_contains_clause(name))
+
+    def fulltext_query(self, query: str) -> Select[tuple[Organization]]:
+        """Строит запрос организаций по полнотекстовому запросу.
+
+        Args:
+            query: Поисковый запрос.
+
+        Returns:
+            Запрос выборки.
+        """
+        tsquery = func.websearch_to_tsquery(FULLTEXT_CONFIG, query)
+        return organization_select().where(
+            Organization.search_vector.op("@@")(tsquery)
+        )
+
+    def radius_query(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        bbox: tuple[float, float, float, float],
+        building_ids: Sequence[int] | None = None,
+    ) -> Select[tuple[Organization]]:
+        """Строит запрос организаций в радиусе.
+
+        Args:
+            lat: Широта центра.
+            lon: Долгота центра.
+            radius_m: Радиус в метрах.
+            bbox: Описывающий прямоугольник (lat_min, lon_min, lat_max, lon_max).
+            building_ids: Идентификаторы зданий внутри радиуса; если заданы,
+                заменяют условия по координатам.
+
+        Returns:
+            Запрос выборки.
+        """
+        if building_ids is not None:
+            condition = in_ids(Organization.building_id, building_ids)
+        else:
+            condition = and_(
+                area_clause(*bbox), distance_m_expr(lat, lon) <= radius_m
+            )
+        return organization_select().where(condition)
+
+    def filters_query(
+        self,
+        name: str | None = None,
+        activity_id: int | None = None,
+        building_id: int | None = None,
+        area: tuple[float, float, float, float] | None = None,
+        center: tuple[float, float, float] | None = None,
+    ) -> Select[tuple[Organization]]:
+        """Строит запрос организаций, удовлетворяющих всем фильтрам.
+
+        Args:
+            name: Фрагмент названия.
+            activity_id: Корень поддерева видов деятельности.
+            building_id: Идентификатор здания.
+            area: Прямоугольник (lat_min, lon_min, lat_max, lon_max).
+            center: Центр и радиус в метрах (lat, lon, radius_m).
+
+        Returns:
+            Запрос выборки.
+        """
+        conditions: list[ColumnElement[bool]] = []
+        if name is not None:
+            conditions.append(name_contains_clause(name))
+        if activity_id is not None:
+            conditions.append(in_activity_subtree_clause(activity_id))
+        if building_id is not None:
+            conditions.append(Organization.building_id == building_id)
+        if area is not None:
+            conditions.append(area_clause(*area))
+        if center is not None:
+            lat, lon, radius_m = center
+            conditions.append(distance_m_expr(lat, lon) <= radius_m)
+        return organization_select().where(*conditions)
 
     async def by_building(
-        self, session: AsyncSession, building_id: int, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        session: AsyncSession,
+        building_id: int,
+        skip: int,
+        limit: int,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
         """Возвращает организации по зданию.
 
         Args:
@@ -23,28 +459,84 @@ class CRUDOrganization(CRUDBase[Organization]):
             building_id: Идентификатор здания.
             skip: Смещение.
             limit: Количество записей.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Последовательность организаций.
+        """
+        return await self._page(
+            session,
+            self.building_query(building_id),
+            skip,
+            limit,
+            after_id,
+            include=include,
+        )
+
+    async def by_buildings(
+        self,
+        session: AsyncSession,
+        building_ids: Sequence[int],
+        skip: int = 0,
+        limit: int | None = None,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
+        """Возвращает организации из набора зданий.
+
+        Args:
+            session: Асинхронная сессия БД.
+            building_ids: Идентификаторы зданий.
+            skip: Смещение.
+            limit: Количество записей, None — без ограничения.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
 
         Returns:
             Последовательность организаций.
         """
+        return await self._page(
+            session,
+            self.buildings_query(building_ids),
+            skip,
+            limit,
+            after_id,
+            include=include,
+        )
+
+    async def count_by_buildings(
+        self, session: AsyncSession, building_ids: Sequence[int]
+    ) -> dict[int, int]:
+        """Считает организации в каждом здании набора без загрузки объектов.
+
+        Args:
+            session: Асинхронная сессия БД.
+            building_ids: Идентификаторы зданий.
+
+        Returns:
+            Словарь building_id -> количество организаций; здания без
+            организаций отсутствуют.
+        """
         stmt = (
-            select(Organization)
-            .where(Organization.building_id == building_id)
-            .options(
-                joinedload(Organization.building),
-                selectinload(Organization.phones),
-                selectinload(Organization.activities),
-            )
-            .order_by(Organization.id)
-            .offset(skip)
-            .limit(limit)
+            select(Organization.building_id, func.count())
+            .where(in_ids(Organization.building_id, building_ids))
+            .group_by(Organization.building_id)
         )
         res = await session.execute(stmt)
-        return list(res.scalars().unique().all())
+        return dict(res.tuples().all())
 
     async def by_activity(
-        self, session: AsyncSession, activity_id: int, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        session: AsyncSession,
+        activity_id: int,
+        skip: int,
+        limit: int,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
         """Возвращает организации по идентификатору вида деятельности.
 
         Args:
@@ -52,25 +544,56 @@ class CRUDOrganization(CRUDBase[Organization]):
             activity_id: Идентификатор вида деятельности.
             skip: Смещение.
             limit: Количество записей.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
 
         Returns:
             Последовательность организаций.
         """
-        stmt = (
-            select(Organization)
-            .join(Organization.activities)
-            .where(Activity.id == activity_id)
-            .options(
-                joinedload(Organization.building),
-                selectinload(Organization.phones),
-                selectinload(Organization.activities),
-            )
-            .order_by(Organization.id)
-            .offset(skip)
-            .limit(limit)
+        return await self._page(
+            session,
+            self.activity_query(activity_id),
+            skip,
+            limit,
+            after_id,
+            include=include,
+        )
+
+    async def by_activity_subtree(
+        self,
+        session: AsyncSession,
+        activity_id: int,
+        skip: int,
+        limit: int,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
+        """Возвращает организации из всего поддерева вида деятельности.
+
+        Поддерево определяется по материализованному пути, поэтому запрос
+        обходится одним индексным соединением без рекурсии.
+
+        Args:
+            session: Асинхронная сессия БД.
+            activity_id: Идентификатор корня поддерева.
+            skip: Смещение.
+            limit: Количество записей.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Последовательность организаций.
+        """
+        return await self._page(
+            session,
+            self.activity_subtree_query(activity_id),
+            skip,
+            limit,
+            after_id,
+            include=include,
         )
-        res = await session.execute(stmt)
-        return list(res.scalars().unique().all())
 
     async def by_area(
         self,
@@ -81,7 +604,9 @@ class CRUDOrganization(CRUDBase[Organization]):
         lon2: float,
         skip: int,
         limit: int,
-    ) -> Sequence[Organization]:
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
         """Возвращает организации по координатам прямоугольной области.
 
         Args:
@@ -92,59 +617,438 @@ class CRUDOrganization(CRUDBase[Organization]):
             lon2: Правая долгота.
             skip: Смещение.
             limit: Количество записей.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
 
         Returns:
             Последовательность организаций.
         """
+        return await self._page(
+            session,
+            self.area_query(lat1, lon1, lat2, lon2),
+            skip,
+            limit,
+            after_id,
+            include=include,
+        )
+
+    async def cluster_cells(
+        self,
+        session: AsyncSession,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float,
+        cell_deg: float,
+    ) -> Sequence[Row[tuple[int, int, int, float, float]]]:
+        """Агрегирует организации области по ячейкам сетки одним запросом.
+
+        Args:
+            session: Асинхронная сессия БД.
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+            cell_deg: Размер ячейки в градусах.
+
+        Returns:
+            Строки (cell_y, cell_x, count, latitude, longitude), где
+            координаты — центроид организаций ячейки.
+        """
+        cell_y, cell_x = cell_key_expr(cell_deg)
         stmt = (
-            select(Organization)
+            select(
+                cell_y.label("cell_y"),
+                cell_x.label("cell_x"),
+                func.count(Organization.id),
+                func.avg(cast(Building.latitude, Float)),
+                func.avg(cast(Building.longitude, Float)),
+            )
             .join(Organization.building)
-            .where(
-                and_(
-                    Building.latitude.between(lat1, lat2),
-                    Building.longitude.between(lon1, lon2),
+            .where(area_clause(lat1, lon1, lat2, lon2))
+            .group_by("cell_y", "cell_x")
+        )
+        res = await session.execute(stmt)
+        return list(res.all())
+
+    async def by_cells(
+        self,
+        session: AsyncSession,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float,
+        cell_deg: float,
+        cells: Sequence[tuple[int, int]],
+        per_cell: int,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[tuple[int, int], OrganizationRead]]:
+        """Возвращает организации из заданных ячеек сетки внутри области.
+
+        Ячейка каждой организации вычисляется тем же `cell_key_expr`, что и
+        в `cluster_cells`, и возвращается вместе с ней; из каждой ячейки
+        берется не больше `per_cell` организаций с наименьшими id.
+
+        Args:
+            session: Асинхронная сессия БД.
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+            cell_deg: Размер ячейки в градусах.
+            cells: Пары (cell_y, cell_x).
+            per_cell: Максимум организаций в одной ячейке.
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Пары ((cell_y, cell_x), организация) по ячейкам и возрастанию id.
+        """
+        cell_y, cell_x = cell_key_expr(cell_deg)
+        ranked = (
+            self._read_query(
+                organization_select().where(
+                    area_clause(lat1, lon1, lat2, lon2),
+                    in_int_pairs(cell_y, cell_x, cells),
                 )
             )
-            .options(
-                joinedload(Organization.building),
-                selectinload(Organization.phones),
-                selectinload(Organization.activities),
+            .add_columns(
+                cell_y.label("cell_y"),
+                cell_x.label("cell_x"),
+                func.row_number()
+                .over(partition_by=(cell_y, cell_x), order_by=Organization.id)
+                .label("rank"),
             )
-            .order_by(Organization.id)
+            .subquery()
+        )
+        stmt = (
+            select(*list(ranked.c)[:-1])
+            .where(ranked.c.rank <= per_cell)
+            .order_by(ranked.c.cell_y, ranked.c.cell_x, ranked.c.id)
+        )
+        res = await session.execute(stmt)
+        rows = res.all()
+        objs = await self._assemble(session, rows, include=include)
+        return [((row[-2], row[-1]), o) for o, row in zip(objs, rows)]
+
+    async def in_radius(
+        self,
+        session: AsyncSession,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        bbox: tuple[float, float, float, float],
+        skip: int,
+        limit: int,
+        building_ids: Sequence[int] | None = None,
+        after: tuple[float, int] | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[OrganizationRead, float]]:
+        """Возвращает организации в радиусе, упорядоченные по расстоянию.
+
+        Bounding box отсекает кандидатов по geohash-индексу, точная
+        проверка по Хаверсину, сортировка и пагинация выполняются в БД.
+        Если здания в радиусе уже известны, вместо этих условий
+        используется фильтр по `building_ids`.
+
+        Args:
+            session: Асинхронная сессия БД.
+            lat: Широта центра.
+            lon: Долгота центра.
+            radius_m: Радиус в метрах.
+            bbox: Описывающий прямоугольник (lat_min, lon_min, lat_max, lon_max).
+            skip: Смещение.
+            limit: Количество записей.
+            building_ids: Идентификаторы зданий внутри радиуса.
+            after: Если задано, только организации после ключа
+                (расстояние, id) (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Пары (организация, расстояние в метрах).
+        """
+        distance = distance_m_expr(lat, lon)
+        stmt = (
+            self._read_query(
+                self.radius_query(lat, lon, radius_m, bbox, building_ids)
+            )
+            .add_columns(distance)
+            .order_by(distance, Organization.id)
             .offset(skip)
             .limit(limit)
         )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(distance, Organization.id) > tuple_(*after)
+            )
         res = await session.execute(stmt)
-        return list(res.scalars().unique().all())
+        rows = res.all()
+        objs = await self._assemble(session, rows, include=include)
+        return [(o, row[-1]) for o, row in zip(objs, rows)]
+
+    async def by_filters(
+        self,
+        session: AsyncSession,
+        skip: int,
+        limit: int,
+        name: str | None = None,
+        activity_id: int | None = None,
+        building_id: int | None = None,
+        area: tuple[float, float, float, float] | None = None,
+        center: tuple[float, float, float] | None = None,
+        after: Sequence[float] | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[OrganizationRead, float | None]]:
+        """Возвращает организации, удовлетворяющие всем заданным фильтрам.
+
+        Условия объединяются в один запрос с одной загрузкой связей и
+        пагинацией в БД. Если задан радиус, результаты упорядочены по
+        расстоянию, иначе по id.
+
+        Args:
+            session: Асинхронная сессия БД.
+            skip: Смещение.
+            limit: Количество записей.
+            name: Фрагмент названия.
+            activity_id: Корень поддерева видов деятельности.
+            building_id: Идентификатор здания.
+            area: Прямоугольник (lat_min, lon_min, lat_max, lon_max); при
+                поиске в радиусе должен содержать круг радиуса.
+            center: Центр и радиус в метрах (lat, lon, radius_m).
+            after: Если задано, только организации после ключа сортировки:
+                (расстояние, id) при поиске в радиусе, иначе (id,).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Пары (организация, расстояние в метрах или None без радиуса).
+        """
+        distance: ColumnElement[float | None] = null()
+        order_by = [Organization.id]
+        if center is not None:
+            distance = distance_m_expr(center[0], center[1])
+            order_by.insert(0, distance)
+        stmt = (
+            self._read_query(
+                self.filters_query(
+                    name, activity_id, building_id, area, center
+                )
+            )
+            .add_columns(distance)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(*order_by) > tuple_(*after))
+        res = await session.execute(stmt)
+        rows = res.all()
+        objs = await self._assemble(session, rows, include=include)
+        return [(o, row[-1]) for o, row in zip(objs, rows)]
 
     async def search_by_name(
-        self, session: AsyncSession, name: str, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        session: AsyncSession,
+        name: str,
+        skip: int,
+        limit: int,
+        after_id: int | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
         """Возвращает организации по фрагменту названия, без учета регистра.
 
+        Условие `lower(name) LIKE '%...%'` обслуживается GIN-индексом
+        `ix_organization_name_trgm` (pg_trgm).
+
         Args:
             session: Асинхронная сессия БД.
             name: Фрагмент названия.
             skip: Смещение.
             limit: Количество записей.
+            after_id: Если задано, только организации с большим id
+                (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
 
         Returns:
             Последовательность организаций.
         """
+        return await self._page(
+            session,
+            self.name_query(name),
+            skip,
+            limit,
+            after_id,
+            include=include,
+        )
+
+    async def fulltext_search(
+        self,
+        session: AsyncSession,
+        query: str,
+        skip: int,
+        limit: int,
+        after: tuple[float, int] | None = None,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[OrganizationRead, float]]:
+        """Возвращает организации по полнотекстовому запросу по релевантности.
+
+        Запрос разбирается `websearch_to_tsquery` со стеммингом русского
+        языка и сопоставляется с `search_vector` по GIN-индексу. Совпадения
+        в названии весят больше, чем в названиях видов деятельности.
+
+        Args:
+            session: Асинхронная сессия БД.
+            query: Поисковый запрос.
+            skip: Смещение.
+            limit: Количество записей.
+            after: Если задано, только организации после ключа
+                (релевантность, id) (keyset-пагинация).
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Пары (организация, релевантность) по убыванию релевантности.
+        """
+        tsquery = func.websearch_to_tsquery(FULLTEXT_CONFIG, query)
+        rank = func.ts_rank_cd(Organization.search_vector, tsquery)
         stmt = (
-            select(Organization)
-            .where(func.lower(Organization.name).ilike(f"%{name.lower()}%"))
-            .options(
-                joinedload(Organization.building),
-                selectinload(Organization.phones),
-                selectinload(Organization.activities),
-            )
-            .order_by(Organization.id)
+            self._read_query(self.fulltext_query(query))
+            .add_columns(rank)
+            .order_by(rank.desc(), Organization.id)
             .offset(skip)
             .limit(limit)
         )
+        if after is not None:
+            last_rank, last_id = after
+            stmt = stmt.where(
+                or_(
+                    rank < last_rank,
+                    and_(rank == last_rank, Organization.id > last_id),
+                )
+            )
+        res = await session.execute(stmt)
+        rows = res.all()
+        objs = await self._assemble(session, rows, include=include)
+        return [(o, row[-1]) for o, row in zip(objs, rows)]
+
+    async def has_trigram_index(self, session: AsyncSession) -> bool:
+        """Проверяет, создан ли триграммный индекс по названию.
+
+        Args:
+            session: Асинхронная сессия БД.
+
+        Returns:
+            True, если индекс существует.
+        """
+        res = await session.execute(
+            text("SELECT 1 FROM pg_indexes WHERE indexname = :name"),
+            {"name": TRIGRAM_INDEX_NAME},
+        )
+        return res.first() is not None
+
+    async def names(
+        self, session: AsyncSession, ids: Sequence[int] | None = None
+    ) -> Sequence[Row[tuple[int, str]]]:
+        """Возвращает названия организаций без загрузки ORM-объектов.
+
+        Args:
+            session: Асинхронная сессия БД.
+            ids: Если задано, только организации с этими идентификаторами.
+
+        Returns:
+            Строки (id, name) по возрастанию id.
+        """
+        stmt = select(Organization.id, Organization.name).order_by(
+            Organization.id
+        )
+        if ids is not None:
+            stmt = stmt.where(in_ids(Organization.id, ids))
         res = await session.execute(stmt)
-        return list(res.scalars().unique().all())
+        return list(res.all())
+
+    async def by_ids(
+        self,
+        session: AsyncSession,
+        ids: Sequence[int],
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
+        """Возвращает организации по идентификаторам в порядке их перечисления.
+
+        Args:
+            session: Асинхронная сессия БД.
+            ids: Идентификаторы организаций.
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Последовательность найденных организаций.
+        """
+        if not ids:
+            return []
+        stmt = self._read_query(
+            organization_select().where(in_ids(Organization.id, ids))
+        )
+        res = await session.execute(stmt)
+        by_id = {
+            o.id: o
+            for o in await self._assemble(session, res.all(), include=include)
+        }
+        return [by_id[id_] for id_ in ids if id_ in by_id]
+
+    async def by_phone(
+        self,
+        session: AsyncSession,
+        phone_digits: str,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Sequence[OrganizationRead]:
+        """Возвращает организации по нормализованному номеру телефона.
+
+        Args:
+            session: Асинхронная сессия БД.
+            phone_digits: Номер из одних цифр.
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Returns:
+            Последовательность организаций.
+        """
+        has_phone = exists().where(
+            OrganizationPhone.organization_id == Organization.id,
+            OrganizationPhone.phone_digits == phone_digits,
+        )
+        return await self._page(
+            session,
+            organization_select().where(has_phone),
+            0,
+            None,
+            include=include,
+        )
+
+    async def stream_all(
+        self,
+        session: AsyncSession,
+        batch_size: int,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> AsyncIterator[list[OrganizationRead]]:
+        """Выгружает все организации пачками через серверный курсор.
+
+        Строки читаются по `batch_size` за раз, запрошенные в `include`
+        связи каждой пачки догружаются отдельными запросами, поэтому
+        в памяти держится только текущая пачка независимо от размера
+        таблицы.
+
+        Args:
+            session: Асинхронная сессия БД.
+            batch_size: Количество организаций в пачке.
+            include: Загружаемые связи из `ORGANIZATION_RELATIONS`.
+
+        Yields:
+            Пачки организаций по возрастанию id.
+        """
+        stmt = (
+            self._read_query(organization_select())
+            .order_by(Organization.id)
+            .execution_options(yield_per=batch_size)
+        )
+        res = await session.stream(stmt)
+        async for batch in res.partitions():
+            yield await self._assemble(session, batch, include=include)
 
     async def get_detail(
         self, session: AsyncSession, organization_id: int
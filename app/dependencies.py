@@ -1,8 +1,9 @@
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
 from .database import get_db
+from .models.read import ORGANIZATION_RELATIONS
 
 
 async def verify_api_key(x_api_key: str | None = Header(default=None)) -> None:
@@ -29,3 +30,30 @@ async def get_session() -> AsyncSession:
     """
     async for s in get_db():
         return s
+
+
+def include_relations(
+    include: str | None = Query(None, max_length=64),
+) -> frozenset[str]:
+    """Разбирает список связей организаций, включаемых в ответ.
+
+    Args:
+        include: Связи через запятую: `phones`, `activities`. Без параметра
+            включаются все, пустое значение — ни одной.
+
+    Returns:
+        Множество включаемых связей.
+
+    Raises:
+        HTTPException: Если указана неизвестная связь.
+    """
+    if include is None:
+        return frozenset(ORGANIZATION_RELATIONS)
+    names = frozenset(n.strip() for n in include.split(",") if n.strip())
+    unknown = names.difference(ORGANIZATION_RELATIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}",
+        )
+    return names
@@ -1,23 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.core.activity_tree import activity_tree
+from app.core.building_index import building_index
+from app.core.cache import prune_cache_changes
+from app.core.pagination import (
+    CURSOR_HEADER,
+    TOTAL_EXACT_HEADER,
+    TOTAL_HEADER,
+)
+from app.core.name_index import name_index
+from app.database import AsyncSessionLocal
 from app.routers.organizations import router as organizations_router
 from app.routers.buildings import router as buildings_router
 from app.routers.activities import router as activities_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Прогревает in-process индексы и запускает очистку их журнала."""
+    async with AsyncSessionLocal() as session:
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(session)
+        await activity_tree.ensure_fresh(session)
+        if await name_index.use_memory(session):
+            await name_index.get_ngrams(session)
+    pruner = asyncio.create_task(prune_cache_changes(AsyncSessionLocal))
+    try:
+        yield
+    finally:
+        pruner.cancel()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     description="REST API для справочника Организаций.",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["GET"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER, TOTAL_HEADER, TOTAL_EXACT_HEADER],
 )
 
 app.include_router(organizations_router)
@@ -20,6 +20,8 @@ class Activity(Base):
         name: Название.
         parent_id: Родительский вид деятельности.
         level: Уровень вложенности от 1 до 3.
+        path: Материализованный путь из идентификаторов от корня, например
+            "1.2.", поддерживается CRUD-слоем.
         created_at: Дата создания.
         updated_at: Дата обновления.
         parent: Родитель.
@@ -35,6 +37,9 @@ class Activity(Base):
         index=True,
     )
     level: Mapped[int] = mapped_column(nullable=False, default=1)
+    path: Mapped[str] = mapped_column(
+        String(255, collation="C"), nullable=False, index=True
+    )
 
     created_at: Mapped[str] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -3,10 +3,11 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, UniqueConstraint, Index, func
+from sqlalchemy import String, UniqueConstraint, Index, func, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import DateTime, Numeric
 
+from app.utils import geohash
 from . import Base
 
 if TYPE_CHECKING:
@@ -21,6 +22,7 @@ class Building(Base):
         address: Уникальный адрес здания.
         latitude: Широта с точностью до 7 знаков.
         longitude: Долгота с точностью до 7 знаков.
+        geohash: Geohash координат, заполняется автоматически при записи.
         created_at: Дата создания.
         updated_at: Дата обновления.
         organizations: Связанные организации.
@@ -36,6 +38,11 @@ class Building(Base):
     longitude: Mapped[Decimal] = mapped_column(
         Numeric(10, 7), nullable=False, index=True
     )
+    geohash: Mapped[str] = mapped_column(
+        String(geohash.MAX_PRECISION, collation="C"),
+        nullable=False,
+        index=True,
+    )
     created_at: Mapped[str] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -54,3 +61,12 @@ class Building(Base):
         UniqueConstraint("address", name="uq_building_address"),
         Index("ix_building_lat_lon", "latitude", "longitude"),
     )
+
+
+@event.listens_for(Building, "before_insert")
+@event.listens_for(Building, "before_update")
+def _fill_geohash(mapper, connection, target: Building) -> None:
+    """Пересчитывает geohash здания по его координатам."""
+    target.geohash = geohash.encode(
+        float(target.latitude), float(target.longitude)
+    )
@@ -0,0 +1,41 @@
+from sqlalchemy import BigInteger, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import DateTime
+
+from . import Base
+
+
+class CacheChange(Base):
+    """Запись журнала изменений таблиц, закэшированных в процессах API.
+
+    Строки добавляются триггерами таблиц `building`, `organization` и
+    `activity` на каждую вставку, изменение и удаление строки.
+
+    Attributes:
+        id: Идентификатор.
+        table_name: Имя измененной таблицы.
+        row_id: Идентификатор измененной строки.
+        xid: Номер транзакции, изменившей строку.
+        created_at: Время записи.
+    """
+
+    id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True
+    )
+    table_name: Mapped[str] = mapped_column(String(63), nullable=False)
+    row_id: Mapped[int] = mapped_column(nullable=False)
+    xid: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+        nullable=False,
+    )
+    created_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    __table_args__ = (
+        Index("ix_cachechange_table_name_xid", "table_name", "xid"),
+    )
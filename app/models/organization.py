@@ -7,12 +7,16 @@ from sqlalchemy import (
     ForeignKey,
     Table,
     Column,
+    Index,
     UniqueConstraint,
+    event,
     func,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import DateTime
 
+from app.utils import phone
 from . import Base
 
 if TYPE_CHECKING:
@@ -31,6 +35,7 @@ organization_activities = Table(
         "activity_id",
         ForeignKey("activity.id", ondelete="RESTRICT"),
         primary_key=True,
+        index=True,
     ),
 )
 
@@ -44,6 +49,8 @@ class Organization(Base):
         building_id: Идентификатор здания.
         created_at: Дата создания.
         updated_at: Дата обновления.
+        search_vector: Полнотекстовый вектор названия (вес A) и названий
+            видов деятельности (вес B); поддерживается триггерами БД.
         building: Связанное здание.
         phones: Список телефонов.
         activities: Виды деятельности.
@@ -66,6 +73,9 @@ class Organization(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     building: Mapped["Building"] = relationship(back_populates="organizations")
     phones: Mapped[list["OrganizationPhone"]] = relationship(
@@ -79,6 +89,21 @@ class Organization(Base):
         back_populates="organizations",
     )
 
+    __table_args__ = (
+        Index(
+            "ix_organization_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # Создается миграцией, только если доступно расширение pg_trgm.
+        Index(
+            "ix_organization_name_trgm",
+            func.lower(name).label("name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"name_lower": "gin_trgm_ops"},
+        ),
+    )
+
 
 class OrganizationPhone(Base):
     """Телефон организации.
@@ -87,6 +112,8 @@ class OrganizationPhone(Base):
         id: Идентификатор.
         organization_id: Идентификатор организации.
         phone_number: Уникальный номер телефона.
+        phone_digits: Номер из одних цифр для поиска, заполняется
+            автоматически при записи.
         organization: Обратная связь с организацией.
     """
 
@@ -99,6 +126,9 @@ class OrganizationPhone(Base):
     phone_number: Mapped[str] = mapped_column(
         String(32), nullable=False, unique=True, index=True
     )
+    phone_digits: Mapped[str] = mapped_column(
+        String(32), nullable=False, index=True
+    )
 
     organization: Mapped["Organization"] = relationship(
         back_populates="phones"
@@ -107,3 +137,10 @@ class OrganizationPhone(Base):
     __table_args__ = (
         UniqueConstraint("phone_number", name="uq_org_phone_phone_number"),
     )
+
+
+@event.listens_for(OrganizationPhone, "before_insert")
+@event.listens_for(OrganizationPhone, "before_update")
+def _fill_phone_digits(mapper, connection, target: OrganizationPhone) -> None:
+    """Пересчитывает нормализованный номер телефона."""
+    target.phone_digits = phone.normalize(target.phone_number)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+# Связи организации, которые списки могут не загружать (параметр include).
+ORGANIZATION_RELATIONS = ("phones", "activities")
+
+
+@dataclass(slots=True)
+class BuildingRead:
+    """Здание в ответах списков организаций.
+
+    Attributes:
+        id: Идентификатор.
+        address: Адрес.
+        latitude: Широта.
+        longitude: Долгота.
+    """
+
+    id: int
+    address: str
+    latitude: Decimal
+    longitude: Decimal
+
+
+@dataclass(slots=True)
+class ActivityRead:
+    """Вид деятельности в ответах списков организаций.
+
+    Attributes:
+        id: Идентификатор.
+        name: Название.
+        parent_id: Идентификатор родителя или None.
+        level: Уровень вложенности.
+    """
+
+    id: int
+    name: str
+    parent_id: int | None
+    level: int
+
+
+@dataclass(slots=True)
+class OrganizationRead:
+    """Организация для чтения, собранная из строк Core без ORM-сущностей.
+
+    Не отслеживается сессией и содержит только поля ответа; здания и виды
+    деятельности общие у всех организаций одной выборки.
+
+    Attributes:
+        id: Идентификатор.
+        name: Название.
+        building_id: Идентификатор здания.
+        building: Здание.
+        phones: Номера телефонов.
+        activities: Виды деятельности.
+    """
+
+    id: int
+    name: str
+    building_id: int
+    building: BuildingRead
+    phones: list[str] = field(default_factory=list)
+    activities: list[ActivityRead] = field(default_factory=list)
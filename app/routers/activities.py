@@ -1,9 +1,145 @@
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import verify_api_key
+from app.core.cache import CachedPayload
+from app.dependencies import verify_api_key, get_session
+from app.schemas.activity import ActivityTreeNode, ActivityCountResponse
+from app.services.activity_service import ActivityService
 
 router = APIRouter(
     prefix="/activities",
     tags=["activities"],
     dependencies=[Depends(verify_api_key)],
 )
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Проверяет If-None-Match слабым сравнением (RFC 9110, 13.1.2).
+
+    Args:
+        etag: Текущий ETag ответа.
+        if_none_match: Значение заголовка If-None-Match.
+
+    Returns:
+        True, если заголовок равен `*` или содержит ETag ответа с префиксом
+        `W/` или без него.
+    """
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    if "*" in tags:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def payload_response(
+    payload: CachedPayload, if_none_match: str | None
+) -> Response:
+    """Отдает сериализованный ответ или 304, если ETag клиента совпадает.
+
+    Args:
+        payload: Заранее сериализованный ответ.
+        if_none_match: Значение заголовка If-None-Match.
+
+    Returns:
+        HTTP-ответ.
+    """
+    headers = {"ETag": payload.etag}
+    if etag_matches(payload.etag, if_none_match):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return Response(
+        content=payload.body, media_type="application/json", headers=headers
+    )
+
+
+@router.get("/tree", response_model=list[ActivityTreeNode])
+async def activities_tree(
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает полное дерево видов деятельности.
+
+    Args:
+        if_none_match: ETag, уже имеющийся у клиента.
+        session: Асинхронная сессия.
+
+    Returns:
+        Дерево видов деятельности.
+    """
+    service = ActivityService(session)
+    return payload_response(await service.tree_payload(), if_none_match)
+
+
+@router.get("/counts", response_model=list[ActivityCountResponse])
+async def activities_counts(
+    lat1: float | None = Query(None, ge=-90, le=90),
+    lon1: float | None = Query(None, ge=-180, le=180),
+    lat2: float | None = Query(None, ge=-90, le=90),
+    lon2: float | None = Query(None, ge=-180, le=180),
+    building_id: int | None = Query(None, ge=1),
+    session: AsyncSession = Depends(get_session),
+) -> list[ActivityCountResponse]:
+    """Возвращает количество организаций в поддереве каждого вида деятельности.
+
+    Args:
+        lat1: Нижняя широта области.
+        lon1: Левая долгота области.
+        lat2: Верхняя широта области.
+        lon2: Правая долгота области.
+        building_id: Идентификатор здания.
+        session: Асинхронная сессия.
+
+    Returns:
+        Количества по всем видам деятельности.
+    """
+    coords = (lat1, lon1, lat2, lon2)
+    bbox = None
+    if any(c is not None for c in coords):
+        if any(c is None for c in coords):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Область задается всеми параметрами lat1, lon1, lat2, lon2",
+            )
+        low_lat, high_lat = sorted([lat1, lat2])
+        low_lon, high_lon = sorted([lon1, lon2])
+        bbox = (low_lat, low_lon, high_lat, high_lon)
+    service = ActivityService(session)
+    counts = await service.organization_counts(
+        bbox=bbox, building_id=building_id
+    )
+    return [
+        ActivityCountResponse(activity_id=id_, count=count)
+        for id_, count in sorted(counts.items())
+    ]
+
+
+@router.get("/{activity_id}/subtree", response_model=ActivityTreeNode)
+async def activity_subtree(
+    activity_id: int = Path(..., ge=1),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает поддерево вида деятельности.
+
+    Args:
+        activity_id: Идентификатор корня поддерева.
+        if_none_match: ETag, уже имеющийся у клиента.
+        session: Асинхронная сессия.
+
+    Returns:
+        Поддерево видов деятельности.
+    """
+    service = ActivityService(session)
+    payload = await service.subtree_payload(activity_id)
+    return payload_response(payload, if_none_match)
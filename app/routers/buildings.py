@@ -1,8 +1,9 @@
 from typing import Sequence
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import set_page_headers
 from app.dependencies import verify_api_key, get_session
 from app.schemas.building import BuildingResponse
 from app.services.building_service import BuildingService
@@ -16,22 +17,35 @@ router = APIRouter(
 
 @router.get("", response_model=list[BuildingResponse])
 async def list_buildings(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
     session: AsyncSession = Depends(get_session),
 ) -> Sequence[BuildingResponse]:
     """Возвращает список зданий с пагинацией.
 
+    Если страница полная, курсор следующей страницы возвращается в
+    заголовке `X-Next-Cursor`. С `with_total` общее количество зданий
+    возвращается в заголовке `X-Total-Count`.
+
     Args:
+        response: Ответ, в который записываются курсор и общее количество.
         skip: Смещение.
         limit: Лимит записей.
+        cursor: Курсор из заголовка `X-Next-Cursor` предыдущей страницы.
+        with_total: Вернуть общее количество зданий.
         session: Асинхронная сессия.
 
     Returns:
         Список зданий.
     """
     service = BuildingService(session)
-    objs = await service.list(skip=skip, limit=limit)
+    page = await service.list(
+        skip=skip, limit=limit, cursor=cursor, with_total=with_total
+    )
+    set_page_headers(response, page)
     return [
         BuildingResponse(
             id=o.id,
@@ -39,5 +53,5 @@ async def list_buildings(
             latitude=o.latitude,
             longitude=o.longitude,
         )
-        for o in objs
+        for o in page.items
     ]
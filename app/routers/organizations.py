@@ -1,13 +1,35 @@
-from typing import Sequence
-
-from fastapi import APIRouter, Depends, Query, Path
+from typing import AsyncIterator, Collection, Iterable, Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Path,
+    HTTPException,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import verify_api_key, get_session
+from app.core.pagination import Page, set_page_headers
+from app.database import AsyncSessionLocal
+from app.dependencies import verify_api_key, get_session, include_relations
+from app.models.read import ORGANIZATION_RELATIONS
 from app.schemas.activity import ActivityResponse
 from app.schemas.building import BuildingResponse
-from app.schemas.organization import OrganizationResponse
+from app.schemas.geo import PolygonSearchRequest, RadiusBatchRequest
+from app.schemas.organization import (
+    OrganizationResponse,
+    OrganizationDistanceResponse,
+    OrganizationClusterResponse,
+    OrganizationSuggestResponse,
+    RadiusProbeResponse,
+)
+from app.services.export_service import ExportService
 from app.services.organization_service import OrganizationService
+from app.utils.geo import decode_polyline
+from app.utils.serialization import OrganizationEncoder, dumps
 
 router = APIRouter(
     prefix="/organizations",
@@ -16,40 +38,54 @@ router = APIRouter(
 )
 
 
-def to_response(objs) -> list[OrganizationResponse]:
-    """Преобразует ORM-объекты в Pydantic-схемы ответа.
+def array_response(items: Iterable[str]) -> Response:
+    """Собирает JSON-ответ из готовых JSON-фрагментов элементов массива.
 
     Args:
-        objs: Последовательность ORM-организаций.
+        items: JSON-фрагменты элементов.
 
     Returns:
-        Список схем ответа.
+        HTTP-ответ с JSON-массивом.
     """
-    result: list[OrganizationResponse] = []
-    for o in objs:
-        br = BuildingResponse(
-            id=o.building.id,
-            address=o.building.address,
-            latitude=o.building.latitude,
-            longitude=o.building.longitude,
-        )
-        acts = [
-            ActivityResponse(
-                id=a.id, name=a.name, parent_id=a.parent_id, level=a.level
-            )
-            for a in o.activities
-        ]
-        phones = [p.phone_number for p in o.phones]
-        result.append(
-            OrganizationResponse(
-                id=o.id,
-                name=o.name,
-                building=br,
-                activities=acts,
-                phones=phones,
-            )
-        )
-    return result
+    return Response(
+        content=f"[{','.join(items)}]".encode("utf-8"),
+        media_type="application/json",
+    )
+
+
+def json_response(
+    objs, include: Collection[str] = ORGANIZATION_RELATIONS
+) -> Response:
+    """Сериализует организации сразу в JSON-ответ без Pydantic-моделей.
+
+    Args:
+        objs: Последовательность OrganizationRead.
+        include: Выводимые связи организаций.
+
+    Returns:
+        HTTP-ответ со списком организаций в форме OrganizationResponse.
+    """
+    return Response(
+        content=OrganizationEncoder(include).organizations(objs),
+        media_type="application/json",
+    )
+
+
+def page_response(
+    page: Page, include: Collection[str] = ORGANIZATION_RELATIONS
+) -> Response:
+    """Сериализует страницу организаций вместе с заголовками пагинации.
+
+    Args:
+        page: Страница организаций.
+        include: Выводимые связи организаций.
+
+    Returns:
+        HTTP-ответ со списком организаций.
+    """
+    response = json_response(page.items, include)
+    set_page_headers(response, page)
+    return response
 
 
 @router.get(
@@ -59,24 +95,35 @@ async def organizations_by_building(
     building_id: int = Path(..., ge=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Возвращает организации в заданном здании.
 
     Args:
         building_id: Идентификатор здания.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
     service = OrganizationService(session)
-    objs = await service.get_by_building(
-        building_id=building_id, skip=skip, limit=limit
+    page = await service.get_by_building(
+        building_id=building_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
     )
-    return to_response(objs)
+    return page_response(page, include)
 
 
 @router.get(
@@ -86,24 +133,59 @@ async def organizations_by_activity(
     activity_id: int = Path(..., ge=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Возвращает организации по виду деятельности.
 
     Args:
         activity_id: Идентификатор деятельности.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
     service = OrganizationService(session)
-    objs = await service.get_by_activity(
-        activity_id=activity_id, skip=skip, limit=limit
+    page = await service.get_by_activity(
+        activity_id=activity_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
     )
-    return to_response(objs)
+    return page_response(page, include)
+
+
+@router.get("/by-phone/{number}", response_model=list[OrganizationResponse])
+async def organizations_by_phone(
+    number: str = Path(..., min_length=1, max_length=32),
+    include: frozenset[str] = Depends(include_relations),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает организации по номеру телефона.
+
+    Номер нормализуется до цифр, поэтому "+7 900 000-00-01" и
+    "89000000001" находят одну и ту же организацию.
+
+    Args:
+        number: Номер телефона в произвольном формате.
+        include: Связи в ответе через запятую: `phones`, `activities`.
+        session: Асинхронная сессия.
+
+    Returns:
+        Список организаций.
+    """
+    service = OrganizationService(session)
+    objs = await service.get_by_phone(number=number, include=include)
+    return json_response(objs, include)
 
 
 @router.get("/in-radius", response_model=list[OrganizationResponse])
@@ -113,8 +195,11 @@ async def organizations_in_radius(
     radius: float = Query(..., gt=0),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Возвращает организации в радиусе, метры.
 
     Args:
@@ -123,16 +208,84 @@ async def organizations_in_radius(
         radius: Радиус в метрах.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
     service = OrganizationService(session)
-    objs = await service.in_radius(
-        lat=lat, lon=lon, radius_m=radius, skip=skip, limit=limit
+    page = await service.in_radius(
+        lat=lat,
+        lon=lon,
+        radius_m=radius,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
+    )
+    return page_response(page, include)
+
+
+@router.post("/in-radius/batch", response_model=list[RadiusProbeResponse])
+async def organizations_in_radius_batch(
+    body: RadiusBatchRequest,
+    include: frozenset[str] = Depends(include_relations),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает организации в радиусе для нескольких точек за один запрос.
+
+    Args:
+        body: Список точек с радиусами и лимит на каждую точку.
+        include: Связи в ответе через запятую: `phones`, `activities`.
+        session: Асинхронная сессия.
+
+    Returns:
+        Результаты в порядке точек запроса, ближайшие организации первыми.
+    """
+    service = OrganizationService(session)
+    results = await service.in_radius_batch(
+        probes=[(p.lat, p.lon, p.radius) for p in body.probes],
+        limit=body.limit,
+        include=include,
+    )
+    encoder = OrganizationEncoder(include)
+    return array_response(
+        f'{{"lat":{dumps(p.lat)},"lon":{dumps(p.lon)},'
+        f'"radius":{dumps(p.radius)},"organizations":{encoder.array(objs)}}}'
+        for p, objs in zip(body.probes, results)
+    )
+
+
+@router.get("/nearest", response_model=list[OrganizationDistanceResponse])
+async def organizations_nearest(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(20, ge=1, le=1000),
+    include: frozenset[str] = Depends(include_relations),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает k ближайших к точке организаций.
+
+    Args:
+        lat: Широта точки.
+        lon: Долгота точки.
+        k: Количество организаций.
+        include: Связи в ответе через запятую: `phones`, `activities`.
+        session: Асинхронная сессия.
+
+    Returns:
+        Список организаций с расстоянием в метрах, от ближних к дальним.
+    """
+    service = OrganizationService(session)
+    pairs = await service.nearest(lat=lat, lon=lon, k=k, include=include)
+    encoder = OrganizationEncoder(include)
+    return array_response(
+        encoder.organization(o, distance_m=round(d, 2)) for o, d in pairs
     )
-    return to_response(objs)
 
 
 @router.get("/in-area", response_model=list[OrganizationResponse])
@@ -143,8 +296,11 @@ async def organizations_in_area(
     lon2: float = Query(..., ge=-180, le=180),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Возвращает организации в прямоугольной области.
 
     Args:
@@ -154,49 +310,132 @@ async def organizations_in_area(
         lon2: Правая долгота.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
     service = OrganizationService(session)
-    objs = await service.in_area(
-        lat1=lat1, lon1=lon1, lat2=lat2, lon2=lon2, skip=skip, limit=limit
+    page = await service.in_area(
+        lat1=lat1,
+        lon1=lon1,
+        lat2=lat2,
+        lon2=lon2,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
     )
-    return to_response(objs)
+    return page_response(page, include)
 
 
-@router.get("/{organization_id}", response_model=OrganizationResponse)
-async def organization_detail(
-    organization_id: int = Path(..., ge=1),
+@router.post("/in-polygon", response_model=list[OrganizationResponse])
+async def organizations_in_polygon(
+    body: PolygonSearchRequest,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> OrganizationResponse:
-    """Возвращает детальную информацию об организации.
+) -> Response:
+    """Возвращает организации внутри многоугольника.
 
     Args:
-        organization_id: Идентификатор организации.
+        body: Многоугольник в GeoJSON или закодированная ломаная.
+        skip: Смещение.
+        limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
-        Организация со связями.
+        Список организаций.
     """
+    if body.polygon is not None:
+        rings = [
+            [(lat, lon) for lon, lat in ring]
+            for ring in body.polygon.coordinates
+        ]
+    else:
+        try:
+            rings = [decode_polyline(body.polyline)]
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e),
+            )
+        if len(rings[0]) < 3:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Многоугольник должен содержать не менее 3 точек",
+            )
+        if not all(
+            -90 <= lat <= 90 and -180 <= lon <= 180 for lat, lon in rings[0]
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Координаты вне допустимого диапазона",
+            )
     service = OrganizationService(session)
-    o = await service.get_detail(organization_id=organization_id)
-    br = BuildingResponse(
-        id=o.building.id,
-        address=o.building.address,
-        latitude=o.building.latitude,
-        longitude=o.building.longitude,
+    page = await service.in_polygon(
+        rings=rings,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
     )
-    acts = [
-        ActivityResponse(
-            id=a.id, name=a.name, parent_id=a.parent_id, level=a.level
-        )
-        for a in o.activities
-    ]
-    phones = [p.phone_number for p in o.phones]
-    return OrganizationResponse(
-        id=o.id, name=o.name, building=br, activities=acts, phones=phones
+    return page_response(page, include)
+
+
+@router.get("/clusters", response_model=list[OrganizationClusterResponse])
+async def organizations_clusters(
+    lat1: float = Query(..., ge=-90, le=90),
+    lon1: float = Query(..., ge=-180, le=180),
+    lat2: float = Query(..., ge=-90, le=90),
+    lon2: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+    threshold: int = Query(10, ge=0, le=100),
+    include: frozenset[str] = Depends(include_relations),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Возвращает кластеры организаций для области карты.
+
+    Args:
+        lat1: Нижняя широта.
+        lon1: Левая долгота.
+        lat2: Верхняя широта.
+        lon2: Правая долгота.
+        zoom: Уровень масштаба карты.
+        threshold: Организации возвращаются для ячеек, где их меньше порога.
+        include: Связи в ответе через запятую: `phones`, `activities`.
+        session: Асинхронная сессия.
+
+    Returns:
+        Список ячеек с количеством и центроидом организаций.
+    """
+    service = OrganizationService(session)
+    cells = await service.clusters(
+        lat1=lat1,
+        lon1=lon1,
+        lat2=lat2,
+        lon2=lon2,
+        zoom=zoom,
+        threshold=threshold,
+        include=include,
+    )
+    encoder = OrganizationEncoder(include)
+    return array_response(
+        f'{{"latitude":{dumps(lat)},"longitude":{dumps(lon)},'
+        f'"count":{count},"organizations":'
+        f'{"null" if objs is None else encoder.array(objs)}}}'
+        for lat, lon, count, objs in cells
     )
 
 
@@ -208,44 +447,268 @@ async def organizations_by_activity_tree(
     activity_id: int = Path(..., ge=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Ищет организации по всему поддереву деятельности.
 
     Args:
         activity_id: Идентификатор корневого вида.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
     service = OrganizationService(session)
-    objs = await service.by_activity_tree(
-        activity_id=activity_id, skip=skip, limit=limit
+    page = await service.by_activity_tree(
+        activity_id=activity_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        include=include,
     )
-    return to_response(objs)
+    return page_response(page, include)
 
 
 @router.get("/search", response_model=list[OrganizationResponse])
 async def organizations_search(
     name: str = Query(..., min_length=1, max_length=255),
+    mode: Literal["substring", "fulltext", "fuzzy"] = Query("substring"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
     session: AsyncSession = Depends(get_session),
-) -> Sequence[OrganizationResponse]:
+) -> Response:
     """Ищет организации по названию.
 
+    Args:
+        name: Фрагмент названия или полнотекстовый запрос.
+        mode: `substring` — вхождение фрагмента, по id; `fulltext` — поиск
+            со стеммингом по названию и видам деятельности, по релевантности;
+            `fuzzy` — поиск по словам названия с опечатками.
+        skip: Смещение.
+        limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
+        session: Асинхронная сессия.
+
+    Returns:
+        Список организаций.
+    """
+    service = OrganizationService(session)
+    page = await service.search_by_name(
+        name=name,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        mode=mode,
+        include=include,
+    )
+    return page_response(page, include)
+
+
+@router.get("/filter", response_model=list[OrganizationResponse])
+async def organizations_filter(
+    name: str | None = Query(None, min_length=1, max_length=255),
+    activity_id: int | None = Query(None, ge=1),
+    building_id: int | None = Query(None, ge=1),
+    lat1: float | None = Query(None, ge=-90, le=90),
+    lon1: float | None = Query(None, ge=-180, le=180),
+    lat2: float | None = Query(None, ge=-90, le=90),
+    lon2: float | None = Query(None, ge=-180, le=180),
+    lat: float | None = Query(None, ge=-90, le=90),
+    lon: float | None = Query(None, ge=-180, le=180),
+    radius: float | None = Query(None, gt=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, max_length=256),
+    with_total: bool = Query(False),
+    include: frozenset[str] = Depends(include_relations),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Ищет организации по сочетанию фильтров.
+
+    Все заданные фильтры применяются одновременно. При поиске в радиусе
+    результаты упорядочены по расстоянию, иначе по id.
+
     Args:
         name: Фрагмент названия.
+        activity_id: Вид деятельности вместе с поддеревом.
+        building_id: Идентификатор здания.
+        lat1: Нижняя широта области.
+        lon1: Левая долгота области.
+        lat2: Верхняя широта области.
+        lon2: Правая долгота области.
+        lat: Широта центра радиуса.
+        lon: Долгота центра радиуса.
+        radius: Радиус в метрах.
         skip: Смещение.
         limit: Лимит.
+        cursor: Курсор из заголовка X-Next-Cursor предыдущей страницы.
+        with_total: Вернуть общее количество в заголовке X-Total-Count.
+        include: Связи в ответе через запятую: `phones`, `activities`.
         session: Асинхронная сессия.
 
     Returns:
         Список организаций.
     """
+    coords = (lat1, lon1, lat2, lon2)
+    bbox = None
+    if any(c is not None for c in coords):
+        if any(c is None for c in coords):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Область задается всеми параметрами lat1, lon1, lat2, lon2",
+            )
+        low_lat, high_lat = sorted([lat1, lat2])
+        low_lon, high_lon = sorted([lon1, lon2])
+        bbox = (low_lat, low_lon, high_lat, high_lon)
+    circle = (lat, lon, radius)
+    center = None
+    if any(c is not None for c in circle):
+        if any(c is None for c in circle):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Радиус задается всеми параметрами lat, lon, radius",
+            )
+        center = circle
     service = OrganizationService(session)
-    objs = await service.search_by_name(name=name, skip=skip, limit=limit)
-    return to_response(objs)
+    page = await service.filter(
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        with_total=with_total,
+        name=name,
+        activity_id=activity_id,
+        building_id=building_id,
+        bbox=bbox,
+        center=center,
+        include=include,
+    )
+    return page_response(page, include)
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def _export_chunks(
+    fmt: str, include: Collection[str]
+) -> AsyncIterator[bytes]:
+    """Выгружает справочник в отдельной сессии на все время потока.
+
+    Сессия запроса закрывается раньше, чем StreamingResponse дочитывает
+    тело, поэтому поток открывает собственную.
+
+    Args:
+        fmt: Формат выгрузки: `ndjson` или `csv`.
+        include: Выгружаемые связи организаций.
+
+    Yields:
+        Фрагменты тела ответа.
+    """
+    async with AsyncSessionLocal() as session:
+        service = ExportService(session)
+        chunks = (
+            service.csv(include) if fmt == "csv" else service.ndjson(include)
+        )
+        async for chunk in chunks:
+            yield chunk
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def organizations_export(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include: frozenset[str] = Depends(include_relations),
+) -> StreamingResponse:
+    """Потоково выгружает весь справочник организаций.
+
+    Организации читаются из БД серверным курсором пачками и отдаются по
+    мере чтения, поэтому память не растет с размером справочника.
+
+    Args:
+        fmt: Формат выгрузки: `ndjson` (по организации на строку в форме
+            OrganizationResponse) или `csv`.
+        include: Выгружаемые связи через запятую: `phones`, `activities`.
+
+    Returns:
+        Потоковый ответ с выгрузкой.
+    """
+    return StreamingResponse(
+        _export_chunks(fmt, include),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="organizations.{fmt}"'
+            )
+        },
+    )
+
+
+@router.get("/suggest", response_model=list[OrganizationSuggestResponse])
+async def organizations_suggest(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_session),
+) -> list[OrganizationSuggestResponse]:
+    """Подсказывает организации по началу слова в названии.
+
+    Args:
+        q: Введенное начало названия или одного из его слов.
+        limit: Лимит подсказок.
+        session: Асинхронная сессия.
+
+    Returns:
+        Список пар идентификатор/название.
+    """
+    service = OrganizationService(session)
+    rows = await service.suggest(q=q, limit=limit)
+    return [OrganizationSuggestResponse(id=id_, name=n) for id_, n in rows]
+
+
+@router.get("/{organization_id}", response_model=OrganizationResponse)
+async def organization_detail(
+    organization_id: int = Path(..., ge=1),
+    session: AsyncSession = Depends(get_session),
+) -> OrganizationResponse:
+    """Возвращает детальную информацию об организации.
+
+    Args:
+        organization_id: Идентификатор организации.
+        session: Асинхронная сессия.
+
+    Returns:
+        Организация со связями.
+    """
+    service = OrganizationService(session)
+    o = await service.get_detail(organization_id=organization_id)
+    br = BuildingResponse(
+        id=o.building.id,
+        address=o.building.address,
+        latitude=o.building.latitude,
+        longitude=o.building.longitude,
+    )
+    acts = [
+        ActivityResponse(
+            id=a.id, name=a.name, parent_id=a.parent_id, level=a.level
+        )
+        for a in o.activities
+    ]
+    phones = [p.phone_number for p in o.phones]
+    return OrganizationResponse(
+        id=o.id, name=o.name, building=br, activities=acts, phones=phones
+    )
@@ -47,3 +47,16 @@ class ActivityResponse(ActivityBase):
     """Схема ответа для вида деятельности."""
 
     pass
+
+
+class ActivityTreeNode(ActivityResponse):
+    """Схема узла дерева видов деятельности."""
+
+    children: list["ActivityTreeNode"] = []
+
+
+class ActivityCountResponse(BaseModel):
+    """Схема количества организаций в поддереве вида деятельности."""
+
+    activity_id: int
+    count: int
@@ -0,0 +1,67 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+class GeoJSONPolygon(BaseModel):
+    """Многоугольник в формате GeoJSON.
+
+    Координаты задаются в порядке [долгота, широта], первое кольцо — внешняя
+    граница, остальные — дыры.
+    """
+
+    type: Literal["Polygon"]
+    coordinates: list[list[tuple[float, float]]]
+
+    @field_validator("coordinates")
+    @classmethod
+    def validate_coordinates(
+        cls, v: list[list[tuple[float, float]]]
+    ) -> list[list[tuple[float, float]]]:
+        """Проверяет кольца и диапазоны координат."""
+        if not v:
+            raise ValueError(
+                "Многоугольник должен содержать хотя бы одно кольцо"
+            )
+        for ring in v:
+            if len(ring) < 4 or ring[0] != ring[-1]:
+                raise ValueError(
+                    "Кольцо должно быть замкнуто и содержать не менее 4 точек"
+                )
+            for lon, lat in ring:
+                if not -180 <= lon <= 180 or not -90 <= lat <= 90:
+                    raise ValueError("Координаты вне допустимого диапазона")
+        return v
+
+
+class PolygonSearchRequest(BaseModel):
+    """Запрос поиска организаций в многоугольнике.
+
+    Многоугольник задается либо GeoJSON, либо закодированной ломаной
+    (Encoded Polyline), которая замыкается автоматически.
+    """
+
+    polygon: GeoJSONPolygon | None = None
+    polyline: str | None = None
+
+    @model_validator(mode="after")
+    def validate_one_of(self) -> "PolygonSearchRequest":
+        """Проверяет, что задан ровно один способ описания многоугольника."""
+        if (self.polygon is None) == (self.polyline is None):
+            raise ValueError("Укажите либо polygon, либо polyline")
+        return self
+
+
+class RadiusProbe(BaseModel):
+    """Точка и радиус одного поиска в пакетном запросе."""
+
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+    radius: float = Field(..., gt=0)
+
+
+class RadiusBatchRequest(BaseModel):
+    """Пакетный запрос поиска организаций в нескольких радиусах."""
+
+    probes: list[RadiusProbe] = Field(..., min_length=1, max_length=500)
+    limit: int = Field(100, ge=1, le=1000)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Sequence
 
-from pydantic import BaseModel, field_validator, constr
+from pydantic import BaseModel, Field, field_validator, constr
 
 from .activity import ActivityResponse
 from .building import BuildingResponse
@@ -67,10 +67,61 @@ class OrganizationInDB(OrganizationBase):
 
 
 class OrganizationResponse(BaseModel):
-    """Схема ответа для организации."""
+    """Схема ответа для организации.
+
+    В списках поля `phones` и `activities` необязательны: связь, не
+    указанная в параметре `include`, не выводится вовсе, а не пустым
+    списком. Пустой список означает, что связь запрошена, но пуста.
+    """
 
     id: int
     name: str
     building: BuildingResponse
-    phones: list[str]
-    activities: Sequence[ActivityResponse]
+    phones: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Телефоны. Отсутствует в ответе списка, если `phones` не указан"
+            " в `include`."
+        ),
+    )
+    activities: Sequence[ActivityResponse] = Field(
+        default_factory=list,
+        description=(
+            "Виды деятельности. Отсутствует в ответе списка, если"
+            " `activities` не указан в `include`."
+        ),
+    )
+
+
+class OrganizationSuggestResponse(BaseModel):
+    """Подсказка автодополнения по названию организации."""
+
+    id: int
+    name: str
+
+
+class OrganizationDistanceResponse(OrganizationResponse):
+    """Схема ответа для организации с расстоянием до точки поиска."""
+
+    distance_m: float
+
+
+class OrganizationClusterResponse(BaseModel):
+    """Схема ответа для ячейки кластеризации карты.
+
+    Организации ячейки возвращаются, только если их меньше порога.
+    """
+
+    latitude: float
+    longitude: float
+    count: int
+    organizations: list[OrganizationResponse] | None = None
+
+
+class RadiusProbeResponse(BaseModel):
+    """Схема ответа для одного поиска пакетного запроса по радиусу."""
+
+    lat: float
+    lon: float
+    radius: float
+    organizations: list[OrganizationResponse]
@@ -1,9 +1,10 @@
-from typing import Sequence
-
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.activity_tree import activity_tree
+from app.core.cache import CachedPayload
+from app.core.counts_cache import facet_counts
 from app.crud.crud_activity import activity_crud
-from app.models.activity import Activity
 
 
 class ActivityService:
@@ -29,24 +30,60 @@ class ActivityService:
         if level < 1 or level > 3:
             raise ValueError("Activity level must be between 1 and 3")
 
-    async def get_all_descendants_ids(self, activity_id: int) -> list[int]:
-        """Возвращает идентификаторы всех дочерних видов деятельности.
+    async def tree_payload(self) -> CachedPayload:
+        """Возвращает заранее сериализованное дерево видов деятельности.
+
+        Returns:
+            JSON дерева с ETag.
+        """
+        await activity_tree.ensure_fresh(self.session)
+        return activity_tree.tree_payload()
+
+    async def subtree_payload(self, activity_id: int) -> CachedPayload:
+        """Возвращает заранее сериализованное поддерево вида деятельности.
 
         Args:
-            activity_id: Идентификатор корневой деятельности.
+            activity_id: Идентификатор корня поддерева.
 
         Returns:
-            Список идентификаторов всех потомков, включая исходный.
-        """
-        collected: set[int] = set()
+            JSON поддерева с ETag.
 
-        async def _collect(aid: int) -> None:
-            collected.add(aid)
-            children: Sequence[Activity] = await activity_crud.get_children(
-                self.session, aid
+        Raises:
+            HTTPException: Если вид деятельности не найден.
+        """
+        await activity_tree.ensure_fresh(self.session)
+        payload = activity_tree.subtree_payload(activity_id)
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Activity not found",
             )
-            for c in children:
-                await _collect(c.id)
+        return payload
 
-        await _collect(activity_id)
-        return list(collected)
+    async def organization_counts(
+        self,
+        bbox: tuple[float, float, float, float] | None = None,
+        building_id: int | None = None,
+    ) -> dict[int, int]:
+        """Возвращает количество организаций в поддереве каждого вида деятельности.
+
+        Результат кэшируется по области подсчета и сбрасывается при записи
+        в связанные таблицы.
+
+        Args:
+            bbox: Необязательная область (lat_min, lon_min, lat_max, lon_max).
+            building_id: Необязательный идентификатор здания.
+
+        Returns:
+            Словарь activity_id -> количество для всех видов деятельности.
+        """
+        key = (bbox, building_id)
+        counts = facet_counts.get(key)
+        if counts is None:
+            await activity_tree.ensure_fresh(self.session)
+            found = await activity_crud.organization_counts(
+                self.session, bbox=bbox, building_id=building_id
+            )
+            counts = {id_: found.get(id_, 0) for id_ in activity_tree.nodes}
+            facet_counts.put(key, counts)
+        return counts
@@ -1,7 +1,8 @@
-from typing import Sequence
-
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.counts_cache import count_total
+from app.core.pagination import Page, cursor_after_id, page_by_id
 from app.crud.crud_building import building_crud
 from app.models.building import Building
 
@@ -17,14 +18,33 @@ class BuildingService:
         """
         self.session = session
 
-    async def list(self, skip: int, limit: int) -> Sequence[Building]:
-        """Возвращает список зданий с пагинацией.
+    async def list(
+        self,
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+    ) -> Page[Building]:
+        """Возвращает страницу зданий по возрастанию id.
 
         Args:
             skip: Смещение.
             limit: Лимит записей.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество зданий.
 
         Returns:
-            Последовательность зданий.
+            Страница зданий.
         """
-        return await building_crud.list(self.session, skip=skip, limit=limit)
+        objs = await building_crud.list(
+            self.session,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+        )
+        page = page_by_id(objs, limit)
+        if with_total:
+            page.total, page.total_exact = await count_total(
+                self.session, building_crud, select(Building)
+            )
+        return page
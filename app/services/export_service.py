@@ -0,0 +1,105 @@
+import csv
+import io
+from typing import AsyncIterator, Collection
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.crud.crud_organization import organization_crud
+from app.models.read import ORGANIZATION_RELATIONS
+from app.utils.serialization import OrganizationEncoder
+
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "building_id",
+    "address",
+    "latitude",
+    "longitude",
+    "phones",
+    "activity_ids",
+)
+CSV_LIST_SEPARATOR = ";"
+# Колонки CSV, заполняемые связями организации.
+CSV_RELATION_COLUMNS = {"phones": "phones", "activities": "activity_ids"}
+
+
+class ExportService:
+    """Сервис потоковой выгрузки справочника организаций."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Создает экземпляр сервиса.
+
+        Args:
+            session: Асинхронная сессия БД.
+        """
+        self.session = session
+
+    async def ndjson(
+        self, include: Collection[str] = ORGANIZATION_RELATIONS
+    ) -> AsyncIterator[bytes]:
+        """Выгружает организации в NDJSON, по фрагменту на пачку.
+
+        Строки имеют форму `OrganizationResponse`; фрагменты зданий и видов
+        деятельности переиспользуются в пределах пачки.
+
+        Args:
+            include: Выгружаемые связи организаций.
+
+        Yields:
+            Строки JSON пачки организаций в UTF-8.
+        """
+        async for batch in organization_crud.stream_all(
+            self.session, settings.EXPORT_BATCH_SIZE, include=include
+        ):
+            encoder = OrganizationEncoder(include)
+            yield "".join(
+                encoder.organization(o) + "\n" for o in batch
+            ).encode("utf-8")
+
+    async def csv(
+        self, include: Collection[str] = ORGANIZATION_RELATIONS
+    ) -> AsyncIterator[bytes]:
+        """Выгружает организации в CSV с заголовком, по фрагменту на пачку.
+
+        Телефоны и идентификаторы видов деятельности записываются в одну
+        ячейку через `;`; колонки не запрошенных связей не выводятся.
+
+        Args:
+            include: Выгружаемые связи организаций.
+
+        Yields:
+            Строки CSV в UTF-8.
+        """
+        skipped = {
+            column
+            for relation, column in CSV_RELATION_COLUMNS.items()
+            if relation not in include
+        }
+        columns = [c for c in CSV_COLUMNS if c not in skipped]
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, columns, extrasaction="ignore")
+        writer.writeheader()
+        async for batch in organization_crud.stream_all(
+            self.session, settings.EXPORT_BATCH_SIZE, include=include
+        ):
+            for o in batch:
+                writer.writerow(
+                    {
+                        "id": o.id,
+                        "name": o.name,
+                        "building_id": o.building.id,
+                        "address": o.building.address,
+                        "latitude": o.building.latitude,
+                        "longitude": o.building.longitude,
+                        "phones": CSV_LIST_SEPARATOR.join(o.phones),
+                        "activity_ids": CSV_LIST_SEPARATOR.join(
+                            str(a.id) for a in o.activities
+                        ),
+                    }
+                )
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode("utf-8")
@@ -1,12 +1,41 @@
-from typing import Sequence
+from bisect import bisect_right
+from math import pi
+from typing import Collection, Sequence
+
+import numpy as np
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.building_index import building_index
+from app.core.counts_cache import count_total
+from app.core.name_index import name_index
+from app.core.pagination import (
+    Page,
+    cursor_after_id,
+    decode_cursor,
+    empty_page,
+    encode_cursor,
+    make_page,
+    page_by_id,
+)
 from app.crud.crud_organization import organization_crud
 from app.models.organization import Organization
-from app.utils.geo import bounding_box_for_radius, filter_by_radius
-from app.services.activity_service import ActivityService
+from app.models.read import ORGANIZATION_RELATIONS, OrganizationRead
+from app.crud.crud_building import building_crud
+from app.utils import phone
+from app.utils.geo import (
+    EARTH_RADIUS_M,
+    bounding_box_for_radius,
+    points_in_polygon,
+    radius_mask,
+)
+
+NEAREST_START_RADIUS_M = 1000.0
+CLUSTER_CELLS_PER_TILE = 4
+MAX_DISTANCE_M = pi * EARTH_RADIUS_M
 
 
 class OrganizationService:
@@ -20,38 +49,98 @@ class OrganizationService:
         """
         self.session = session
 
+    async def _with_total(
+        self,
+        page: Page[OrganizationRead],
+        query: Select[tuple[Organization]],
+        with_total: bool,
+    ) -> Page[OrganizationRead]:
+        """Дополняет страницу общим количеством строк запроса.
+
+        Args:
+            page: Страница выборки.
+            query: Запрос выборки без загрузки связей и пагинации.
+            with_total: Считать ли общее количество.
+
+        Returns:
+            Та же страница.
+        """
+        if with_total:
+            page.total, page.total_exact = await count_total(
+                self.session, organization_crud, query
+            )
+        return page
+
     async def get_by_building(
-        self, building_id: int, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        building_id: int,
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
         """Возвращает организации по зданию.
 
         Args:
             building_id: Идентификатор здания.
             skip: Смещение.
             limit: Лимит записей.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Последовательность организаций.
+            Страница организаций по возрастанию id.
         """
-        return await organization_crud.by_building(
-            self.session, building_id=building_id, skip=skip, limit=limit
+        objs = await organization_crud.by_building(
+            self.session,
+            building_id=building_id,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+            include=include,
+        )
+        return await self._with_total(
+            page_by_id(objs, limit),
+            organization_crud.building_query(building_id),
+            with_total,
         )
 
     async def get_by_activity(
-        self, activity_id: int, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        activity_id: int,
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
         """Возвращает организации по виду деятельности.
 
         Args:
             activity_id: Идентификатор деятельности.
             skip: Смещение.
             limit: Лимит записей.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Последовательность организаций.
+            Страница организаций по возрастанию id.
         """
-        return await organization_crud.by_activity(
-            self.session, activity_id=activity_id, skip=skip, limit=limit
+        objs = await organization_crud.by_activity(
+            self.session,
+            activity_id=activity_id,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+            include=include,
+        )
+        return await self._with_total(
+            page_by_id(objs, limit),
+            organization_crud.activity_query(activity_id),
+            with_total,
         )
 
     async def get_detail(self, organization_id: int) -> Organization:
@@ -74,23 +163,139 @@ class OrganizationService:
             )
         return obj
 
+    async def get_by_phone(
+        self, number: str, include: Collection[str] = ORGANIZATION_RELATIONS
+    ) -> Sequence[OrganizationRead]:
+        """Возвращает организации по номеру телефона в любом формате.
+
+        Args:
+            number: Номер телефона.
+            include: Загружаемые связи организаций.
+
+        Returns:
+            Последовательность организаций.
+
+        Raises:
+            HTTPException: Если в номере нет цифр.
+        """
+        digits = phone.normalize(number)
+        if not digits:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Invalid phone number",
+            )
+        return await organization_crud.by_phone(
+            self.session, phone_digits=digits, include=include
+        )
+
     async def search_by_name(
-        self, name: str, skip: int, limit: int
-    ) -> Sequence[Organization]:
-        """Ищет организации по фрагменту названия.
+        self,
+        name: str,
+        skip: int,
+        limit: int,
+        mode: str = "substring",
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
+        """Ищет организации по названию.
+
+        В режиме `substring` ищется вхождение фрагмента; если в БД нет
+        триграммного индекса, совпадения находятся по in-process индексу
+        триграмм, а из БД загружается только страница. В режиме `fulltext`
+        выполняется полнотекстовый поиск по названию и видам деятельности с
+        сортировкой по релевантности. В режиме `fuzzy` каждое слово запроса
+        должно совпасть со словом названия с учетом опечаток; результаты
+        упорядочены по суммарному числу опечаток.
 
         Args:
-            name: Фрагмент.
+            name: Фрагмент или поисковый запрос.
             skip: Смещение.
             limit: Лимит.
+            mode: Режим поиска: `substring`, `fulltext` или `fuzzy`.
+            cursor: Курсор предыдущей страницы того же режима.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Последовательность организаций.
+            Страница организаций.
         """
-        return await organization_crud.search_by_name(
-            self.session, name=name, skip=skip, limit=limit
+        if mode == "fulltext":
+            after = tuple(decode_cursor(cursor, 2)) if cursor else None
+            rows = await organization_crud.fulltext_search(
+                self.session,
+                query=name,
+                skip=skip,
+                limit=limit,
+                after=after,
+                include=include,
+            )
+            key = [rows[-1][1], rows[-1][0].id] if rows else None
+            return await self._with_total(
+                make_page([o for o, _ in rows], limit, key),
+                organization_crud.fulltext_query(name),
+                with_total,
+            )
+        if mode == "fuzzy":
+            after = tuple(decode_cursor(cursor, 2)) if cursor else None
+            fuzzy = await name_index.get_fuzzy(self.session)
+            found = fuzzy.search(name, limit=skip + limit, after=after)[skip:]
+            objs = await organization_crud.by_ids(
+                self.session, [id_ for id_, _ in found], include=include
+            )
+            page = Page(list(objs))
+            if len(found) == limit:
+                page.next_cursor = encode_cursor(found[-1][::-1])
+            if with_total:
+                page.total = len(fuzzy.search(name))
+            return page
+        if await name_index.use_memory(self.session):
+            ngrams = await name_index.get_ngrams(self.session)
+            matched = ngrams.search(name)
+            ids = matched
+            after_id = cursor_after_id(cursor)
+            if after_id is not None:
+                ids = ids[bisect_right(ids, after_id) :]
+            ids = ids[skip : skip + limit]
+            objs = await organization_crud.by_ids(
+                self.session, ids, include=include
+            )
+            page = Page(list(objs))
+            if len(ids) == limit:
+                page.next_cursor = encode_cursor([ids[-1]])
+            if with_total:
+                page.total = len(matched)
+            return page
+        objs = await organization_crud.search_by_name(
+            self.session,
+            name=name,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+            include=include,
+        )
+        return await self._with_total(
+            page_by_id(objs, limit),
+            organization_crud.name_query(name),
+            with_total,
         )
 
+    async def suggest(self, q: str, limit: int) -> list[tuple[int, str]]:
+        """Подсказывает организации по началу слова в названии.
+
+        Ответ строится целиком по in-process индексу названий без загрузки
+        организаций из БД.
+
+        Args:
+            q: Начало слова в названии.
+            limit: Лимит подсказок.
+
+        Returns:
+            Пары (идентификатор, название).
+        """
+        prefixes = await name_index.get_prefixes(self.session)
+        return prefixes.search(q, limit)
+
     async def in_area(
         self,
         lat1: float,
@@ -99,9 +304,15 @@ class OrganizationService:
         lon2: float,
         skip: int,
         limit: int,
-    ) -> Sequence[Organization]:
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
         """Ищет организации внутри прямоугольной области.
 
+        Здания области берутся из in-process индекса, если он включен,
+        иначе фильтрация выполняется по координатам в БД.
+
         Args:
             lat1: Нижняя широта.
             lon1: Левая долгота.
@@ -109,61 +320,194 @@ class OrganizationService:
             lon2: Правая долгота.
             skip: Смещение.
             limit: Лимит.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Последовательность организаций.
+            Страница организаций по возрастанию id.
         """
         low_lat, high_lat = sorted([lat1, lat2])
         low_lon, high_lon = sorted([lon1, lon2])
-        return await organization_crud.by_area(
-            self.session,
-            lat1=low_lat,
-            lon1=low_lon,
-            lat2=high_lat,
-            lon2=high_lon,
-            skip=skip,
-            limit=limit,
+        after_id = cursor_after_id(cursor)
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(self.session)
+            building_ids = building_index.grid.in_area(
+                low_lat, low_lon, high_lat, high_lon
+            )
+            if not building_ids:
+                return empty_page(with_total)
+            objs = await organization_crud.by_buildings(
+                self.session,
+                building_ids=building_ids,
+                skip=skip,
+                limit=limit,
+                after_id=after_id,
+                include=include,
+            )
+            query = organization_crud.buildings_query(building_ids)
+        else:
+            objs = await organization_crud.by_area(
+                self.session,
+                lat1=low_lat,
+                lon1=low_lon,
+                lat2=high_lat,
+                lon2=high_lon,
+                skip=skip,
+                limit=limit,
+                after_id=after_id,
+                include=include,
+            )
+            query = organization_crud.area_query(
+                low_lat, low_lon, high_lat, high_lon
+            )
+        return await self._with_total(
+            page_by_id(objs, limit), query, with_total
         )
 
     async def by_activity_tree(
-        self, activity_id: int, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        activity_id: int,
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
         """Ищет организации по всему поддереву деятельности.
 
+        Поддерево определяется по материализованному пути видов
+        деятельности, организации выбираются одним запросом с
+        дедупликацией и пагинацией в БД.
+
         Args:
             activity_id: Корневой идентификатор.
             skip: Смещение.
             limit: Лимит.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Последовательность организаций.
+            Страница организаций по возрастанию id.
         """
-        a_service = ActivityService(self.session)
-        ids = await a_service.get_all_descendants_ids(activity_id)
-        result: list[Organization] = []
-        for aid in ids:
-            chunk = await organization_crud.by_activity(
-                self.session, activity_id=aid, skip=0, limit=limit + skip
-            )
-            result.extend(chunk)
-        dedup: dict[int, Organization] = {o.id: o for o in result}
-        ordered = sorted(dedup.values(), key=lambda x: x.id)
-        return ordered[skip : skip + limit]
+        objs = await organization_crud.by_activity_subtree(
+            self.session,
+            activity_id=activity_id,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+            include=include,
+        )
+        return await self._with_total(
+            page_by_id(objs, limit),
+            organization_crud.activity_subtree_query(activity_id),
+            with_total,
+        )
+
+    async def filter(
+        self,
+        skip: int,
+        limit: int,
+        name: str | None = None,
+        activity_id: int | None = None,
+        building_id: int | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        center: tuple[float, float, float] | None = None,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
+        """Ищет организации по сочетанию фильтров одним запросом к БД.
+
+        Прямоугольник и описывающий прямоугольник радиуса пересекаются в
+        одну область, которая отсекает здания по geohash-индексу.
+
+        Args:
+            skip: Смещение.
+            limit: Лимит.
+            name: Фрагмент названия.
+            activity_id: Корень поддерева видов деятельности.
+            building_id: Идентификатор здания.
+            bbox: Прямоугольник (lat_min, lon_min, lat_max, lon_max).
+            center: Центр и радиус в метрах (lat, lon, radius_m).
+            cursor: Курсор предыдущей страницы с теми же фильтрами.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
+
+        Returns:
+            Страница организаций; при поиске в радиусе — от ближних к
+            дальним, иначе по возрастанию id.
+        """
+        key_size = 1 if center is None else 2
+        after = decode_cursor(cursor, key_size) if cursor else None
+        area = bbox
+        if center is not None:
+            circle = bounding_box_for_radius(*center)
+            if area is None:
+                area = circle
+            else:
+                area = (
+                    max(area[0], circle[0]),
+                    max(area[1], circle[1]),
+                    min(area[2], circle[2]),
+                    min(area[3], circle[3]),
+                )
+        if area is not None and (area[0] > area[2] or area[1] > area[3]):
+            return empty_page(with_total)
+        rows = await organization_crud.by_filters(
+            self.session,
+            skip=skip,
+            limit=limit,
+            name=name,
+            activity_id=activity_id,
+            building_id=building_id,
+            area=area,
+            center=center,
+            after=after,
+            include=include,
+        )
+        key = None
+        if rows:
+            last, distance = rows[-1]
+            key = [last.id] if center is None else [distance, last.id]
+        return await self._with_total(
+            make_page([o for o, _ in rows], limit, key),
+            organization_crud.filters_query(
+                name, activity_id, building_id, area, center
+            ),
+            with_total,
+        )
 
     async def in_radius(
-        self, lat: float, lon: float, radius_m: float, skip: int, limit: int
-    ) -> Sequence[Organization]:
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
         """Ищет организации в радиусе, используя bounding box + точную фильтрацию по Хаверсину.
 
+        Здания в радиусе берутся из in-process индекса (если он включен),
+        сортировка по расстоянию и пагинация выполняются в БД, поэтому
+        загружаются только организации запрошенной страницы.
+
         Args:
             lat: Широта центра.
             lon: Долгота центра.
             radius_m: Радиус поиска в метрах.
             skip: Смещение.
             limit: Лимит.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
 
         Returns:
-            Список организаций внутри радиуса.
+            Страница организаций внутри радиуса, от ближних к дальним.
         """
         if radius_m <= 0:
             raise HTTPException(
@@ -171,25 +515,316 @@ class OrganizationService:
                 detail="Radius must be positive",
             )
 
-        lat_min, lon_min, lat_max, lon_max = bounding_box_for_radius(
-            lat, lon, radius_m
+        after = tuple(decode_cursor(cursor, 2)) if cursor else None
+        bbox = bounding_box_for_radius(lat, lon, radius_m)
+        building_ids: list[int] | None = None
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(self.session)
+            building_ids = [
+                id_
+                for id_, _ in building_index.grid.in_radius(lat, lon, radius_m)
+            ]
+            if not building_ids:
+                return empty_page(with_total)
+        rows = await organization_crud.in_radius(
+            self.session,
+            lat=lat,
+            lon=lon,
+            radius_m=radius_m,
+            bbox=bbox,
+            skip=skip,
+            limit=limit,
+            building_ids=building_ids,
+            after=after,
+            include=include,
         )
+        key = [rows[-1][1], rows[-1][0].id] if rows else None
+        return await self._with_total(
+            make_page([o for o, _ in rows], limit, key),
+            organization_crud.radius_query(
+                lat, lon, radius_m, bbox, building_ids
+            ),
+            with_total,
+        )
+
+    async def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[OrganizationRead, float]]:
+        """Возвращает k ближайших организаций вместе с расстоянием до них.
+
+        С индексом зданий берутся n ближайших зданий (начиная с n = k); если
+        в них меньше k организаций, n удваивается. Без индекса радиус поиска
+        в БД расширяется, пока в него не попадут k организаций. В обоих
+        случаях поиск останавливается, как только k ближайших гарантированно
+        найдены.
+
+        Args:
+            lat: Широта точки.
+            lon: Долгота точки.
+            k: Количество организаций.
+            include: Загружаемые связи организаций.
+
+        Returns:
+            Пары (организация, расстояние в метрах) от ближних к дальним.
+        """
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(self.session)
+            n = k
+            while True:
+                buildings = building_index.grid.nearest(lat, lon, n)
+                if not buildings:
+                    return []
+                radius_m = buildings[-1][1]
+                rows = await organization_crud.in_radius(
+                    self.session,
+                    lat=lat,
+                    lon=lon,
+                    radius_m=radius_m,
+                    bbox=bounding_box_for_radius(lat, lon, radius_m),
+                    skip=0,
+                    limit=k,
+                    building_ids=[id_ for id_, _ in buildings],
+                    include=include,
+                )
+                if len(rows) == k or len(buildings) < n:
+                    break
+                n *= 2
+        else:
+            radius_m = NEAREST_START_RADIUS_M
+            while True:
+                rows = await organization_crud.in_radius(
+                    self.session,
+                    lat=lat,
+                    lon=lon,
+                    radius_m=radius_m,
+                    bbox=bounding_box_for_radius(lat, lon, radius_m),
+                    skip=0,
+                    limit=k,
+                    include=include,
+                )
+                if len(rows) == k or radius_m >= MAX_DISTANCE_M:
+                    break
+                radius_m *= 4
+        return rows
+
+    async def clusters(
+        self,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float,
+        zoom: int,
+        threshold: int,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[tuple[float, float, int, Sequence[OrganizationRead] | None]]:
+        """Кластеризует организации области по сетке, зависящей от масштаба.
+
+        Ширина ячейки — четверть тайла карты на уровне `zoom`. Количество и
+        центроид считаются одним групповым запросом; организации
+        загружаются только для ячеек, где их меньше `threshold`, и не больше
+        `threshold` на ячейку, даже если ячейку успели дополнить.
+
+        Args:
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+            zoom: Уровень масштаба карты.
+            threshold: Порог количества организаций в ячейке.
+            include: Загружаемые связи организаций.
 
-        candidates = await organization_crud.by_area(
+        Returns:
+            Кортежи (широта, долгота, количество, организации или None).
+
+        Raises:
+            HTTPException: Если область покрывает больше
+                `CLUSTER_MAX_CELLS` ячеек сетки.
+        """
+        low_lat, high_lat = sorted([lat1, lat2])
+        low_lon, high_lon = sorted([lon1, lon2])
+        cell_deg = 360.0 / (2**zoom * CLUSTER_CELLS_PER_TILE)
+        cell_count = ((high_lat - low_lat) / cell_deg + 1) * (
+            (high_lon - low_lon) / cell_deg + 1
+        )
+        if cell_count > settings.CLUSTER_MAX_CELLS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Area is too large for this zoom level",
+            )
+        area = dict(lat1=low_lat, lon1=low_lon, lat2=high_lat, lon2=high_lon)
+        cells = await organization_crud.cluster_cells(
+            self.session, cell_deg=cell_deg, **area
+        )
+        small = [
+            (cy, cx) for cy, cx, count, _, _ in cells if count < threshold
+        ]
+        members: dict[tuple[int, int], list[OrganizationRead]] = {}
+        if small:
+            pairs = await organization_crud.by_cells(
+                self.session,
+                cell_deg=cell_deg,
+                cells=small,
+                per_cell=threshold,
+                include=include,
+                **area,
+            )
+            for key, o in pairs:
+                members.setdefault(key, []).append(o)
+        return [
+            (
+                lat,
+                lon,
+                count,
+                members.get((cy, cx), []) if count < threshold else None,
+            )
+            for cy, cx, count, lat, lon in cells
+        ]
+
+    async def in_polygon(
+        self,
+        rings: Sequence[Sequence[tuple[float, float]]],
+        skip: int,
+        limit: int,
+        cursor: str | None = None,
+        with_total: bool = False,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> Page[OrganizationRead]:
+        """Ищет организации внутри многоугольника.
+
+        Здания предварительно отбираются по описывающему прямоугольнику тем
+        же путем, что и в `in_area`, затем векторно проверяются на попадание
+        в многоугольник. Пагинация выполняется в БД только по подошедшим
+        зданиям.
+
+        Args:
+            rings: Кольца многоугольника из пар (широта, долгота); первое —
+                внешняя граница, остальные — дыры.
+            skip: Смещение.
+            limit: Лимит.
+            cursor: Курсор предыдущей страницы.
+            with_total: Считать ли общее количество организаций.
+            include: Загружаемые связи организаций.
+
+        Returns:
+            Страница организаций по возрастанию id.
+        """
+        outer = rings[0]
+        lat1 = min(p[0] for p in outer)
+        lat2 = max(p[0] for p in outer)
+        lon1 = min(p[1] for p in outer)
+        lon2 = max(p[1] for p in outer)
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(self.session)
+            points = building_index.grid.points_in_area(lat1, lon1, lat2, lon2)
+        else:
+            points = await building_crud.coordinates_in_area(
+                self.session, lat1=lat1, lon1=lon1, lat2=lat2, lon2=lon2
+            )
+        if not points:
+            return empty_page(with_total)
+        coords = np.array([(p[1], p[2]) for p in points], dtype=np.float64)
+        mask = points_in_polygon(coords[:, 0], coords[:, 1], rings)
+        building_ids = [p[0] for p, inside in zip(points, mask) if inside]
+        if not building_ids:
+            return empty_page(with_total)
+        objs = await organization_crud.by_buildings(
             self.session,
-            lat1=lat_min,
-            lon1=lon_min,
-            lat2=lat_max,
-            lon2=lon_max,
-            skip=0,
-            limit=10_000,
+            building_ids=building_ids,
+            skip=skip,
+            limit=limit,
+            after_id=cursor_after_id(cursor),
+            include=include,
         )
+        return await self._with_total(
+            page_by_id(objs, limit),
+            organization_crud.buildings_query(building_ids),
+            with_total,
+        )
+
+    async def in_radius_batch(
+        self,
+        probes: Sequence[tuple[float, float, float]],
+        limit: int,
+        include: Collection[str] = ORGANIZATION_RELATIONS,
+    ) -> list[list[OrganizationRead]]:
+        """Ищет организации сразу для нескольких точек и радиусов.
+
+        Здания всех поисков определяются одним проходом (по индексу или
+        одним запросом координат), затем одним запросом считаются
+        организации в зданиях, чтобы каждому поиску взять только ближайшие
+        здания, покрывающие `limit`. Организации всех отобранных зданий
+        загружаются одной общей выборкой и раскладываются по поискам.
+
+        Args:
+            probes: Тройки (широта, долгота, радиус в метрах).
+            limit: Лимит организаций на один поиск.
+            include: Загружаемые связи организаций.
 
-        def _coords_from_org(o: Organization) -> tuple[float, float]:
-            return float(o.building.latitude), float(o.building.longitude)
+        Returns:
+            Списки организаций в порядке поисков, каждый от ближних к
+            дальним.
+        """
+        if settings.SPATIAL_INDEX_ENABLED:
+            await building_index.ensure_fresh(self.session)
+            found = [
+                building_index.grid.in_radius(lat, lon, radius_m)
+                for lat, lon, radius_m in probes
+            ]
+        else:
+            rows = await building_crud.coordinates_in_areas(
+                self.session,
+                [bounding_box_for_radius(*probe) for probe in probes],
+            )
+            ids = np.array([r[0] for r in rows], dtype=np.int64)
+            coords = np.array(
+                [(r[1], r[2]) for r in rows], dtype=np.float64
+            ).reshape(-1, 2)
+            found = []
+            for lat, lon, radius_m in probes:
+                mask, distances = radius_mask(
+                    lat, lon, coords[:, 0], coords[:, 1], radius_m
+                )
+                found.append(
+                    list(zip(ids[mask].tolist(), distances[mask].tolist()))
+                )
+
+        all_ids = {id_ for buildings in found for id_, _ in buildings}
+        if not all_ids:
+            return [[] for _ in probes]
+        counts = await organization_crud.count_by_buildings(
+            self.session, list(all_ids)
+        )
 
-        filtered = filter_by_radius(
-            candidates, _coords_from_org, lat, lon, radius_m
+        taken: list[list[int]] = []
+        for buildings in found:
+            ids_for_probe: list[int] = []
+            total = 0
+            for id_, _ in sorted(buildings, key=lambda b: (b[1], b[0])):
+                if total >= limit:
+                    break
+                if counts.get(id_):
+                    ids_for_probe.append(id_)
+                    total += counts[id_]
+            taken.append(ids_for_probe)
+
+        needed = {id_ for ids_for_probe in taken for id_ in ids_for_probe}
+        objs = (
+            await organization_crud.by_buildings(
+                self.session, building_ids=list(needed), include=include
+            )
+            if needed
+            else []
         )
-        ordered = sorted(filtered, key=lambda x: x.id)
-        return ordered[skip : skip + limit]
+        by_building: dict[int, list[OrganizationRead]] = {}
+        for o in objs:
+            by_building.setdefault(o.building_id, []).append(o)
+        return [
+            [o for id_ in ids_for_probe for o in by_building.get(id_, [])][
+                :limit
+            ]
+            for ids_for_probe in taken
+        ]
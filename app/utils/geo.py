@@ -1,5 +1,9 @@
 from math import radians, sin, cos, asin, sqrt, degrees
-from typing import Tuple, Iterable, List
+from typing import Tuple, Iterable, List, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
 
 
 def haversine_distance_m(
@@ -16,7 +20,6 @@ def haversine_distance_m(
     Returns:
         Расстояние между точками в метрах.
     """
-    r = 6371000.0
     d_lat = radians(lat2 - lat1)
     d_lon = radians(lon2 - lon1)
     a = (
@@ -24,7 +27,59 @@ def haversine_distance_m(
         + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
     )
     c = 2 * asin(sqrt(a))
-    return r * c
+    return EARTH_RADIUS_M * c
+
+
+def haversine_distances_m(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+) -> np.ndarray:
+    """Вычисляет расстояния в метрах от центра до массива точек за один проход.
+
+    Args:
+        center_lat: Широта центра в градусах.
+        center_lon: Долгота центра в градусах.
+        lats: Массив широт точек в градусах.
+        lons: Массив долгот точек в градусах.
+
+    Returns:
+        Массив расстояний в метрах той же длины, что и входные массивы.
+    """
+    lat_r = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_r = np.radians(np.asarray(lons, dtype=np.float64))
+    c_lat = radians(center_lat)
+    a = (
+        np.sin((lat_r - c_lat) / 2) ** 2
+        + cos(c_lat)
+        * np.cos(lat_r)
+        * np.sin((lon_r - radians(center_lon)) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def radius_mask(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    radius_m: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Определяет, какие точки массива лежат в радиусе от центра.
+
+    Args:
+        center_lat: Широта центра в градусах.
+        center_lon: Долгота центра в градусах.
+        lats: Массив широт точек в градусах.
+        lons: Массив долгот точек в градусах.
+        radius_m: Радиус в метрах.
+
+    Returns:
+        Кортеж (булева маска попадания в радиус, массив расстояний в метрах).
+    """
+    distances = haversine_distances_m(center_lat, center_lon, lats, lons)
+    return distances <= radius_m, distances
 
 
 def bounding_box_for_radius(
@@ -43,10 +98,10 @@ def bounding_box_for_radius(
     Returns:
         Кортеж (lat_min, lon_min, lat_max, lon_max).
     """
-    earth_radius = 6371000.0
-    lat_delta = degrees(radius_m / earth_radius)
+    lat_delta = degrees(radius_m / EARTH_RADIUS_M)
     lon_delta = degrees(
-        radius_m / (earth_radius * cos(radians(lat)) if abs(lat) < 90 else 1.0)
+        radius_m
+        / (EARTH_RADIUS_M * cos(radians(lat)) if abs(lat) < 90 else 1.0)
     )
     lat_min = lat - lat_delta
     lat_max = lat + lat_delta
@@ -97,14 +152,88 @@ def filter_by_radius(
     Returns:
         Список объектов внутри радиуса.
     """
-    result: List[object] = []
-    for it in items:
-        lat, lon = extract_latlon(it)
-        if (
-            haversine_distance_m(
-                center_lat, center_lon, float(lat), float(lon)
-            )
-            <= radius_m
-        ):
-            result.append(it)
-    return result
+    items = list(items)
+    if not items:
+        return []
+    coords = np.array(
+        [extract_latlon(it) for it in items], dtype=np.float64
+    ).reshape(-1, 2)
+    mask, _ = radius_mask(
+        center_lat, center_lon, coords[:, 0], coords[:, 1], radius_m
+    )
+    return [it for it, inside in zip(items, mask) if inside]
+
+
+def points_in_polygon(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    rings: Sequence[Sequence[Tuple[float, float]]],
+) -> np.ndarray:
+    """Проверяет принадлежность массива точек многоугольнику за один проход.
+
+    Используется трассировка луча по правилу чет-нечет: точка внутри, если
+    луч из нее пересекает границы колец нечетное число раз. Поэтому внутренние
+    кольца (дыры) исключаются без отдельной обработки. Цикл идет по ребрам
+    многоугольника, все точки обрабатываются векторно.
+
+    Args:
+        lats: Массив широт точек.
+        lons: Массив долгот точек.
+        rings: Кольца многоугольника, каждое — последовательность
+            (широта, долгота); первое — внешняя граница.
+
+    Returns:
+        Булева маска точек внутри многоугольника.
+    """
+    y = np.asarray(lats, dtype=np.float64)
+    x = np.asarray(lons, dtype=np.float64)
+    inside = np.zeros(y.shape, dtype=bool)
+    for ring in rings:
+        pts = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+        y1, x1 = pts[:, 0], pts[:, 1]
+        y2, x2 = np.roll(y1, -1), np.roll(x1, -1)
+        for ay, ax, by, bx in zip(y1, x1, y2, x2):
+            if ay == by:
+                continue
+            crosses = (ay > y) != (by > y)
+            x_cross = ax + (y - ay) * (bx - ax) / (by - ay)
+            inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def decode_polyline(
+    encoded: str, precision: int = 5
+) -> List[Tuple[float, float]]:
+    """Декодирует строку в формате Encoded Polyline в список координат.
+
+    Args:
+        encoded: Закодированная ломаная.
+        precision: Количество знаков после запятой в кодировке.
+
+    Returns:
+        Список пар (широта, долгота).
+
+    Raises:
+        ValueError: Если строка повреждена.
+    """
+    factor = 10**precision
+    coords: List[Tuple[float, float]] = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                if index >= len(encoded):
+                    raise ValueError("Некорректная закодированная ломаная")
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append((lat / factor, lon / factor))
+    return coords
@@ -0,0 +1,116 @@
+from math import floor
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12
+
+
+def _bits(precision: int) -> Tuple[int, int]:
+    """Возвращает количество бит долготы и широты для заданной точности."""
+    total = 5 * precision
+    return (total + 1) // 2, total // 2
+
+
+def _cell_xy(
+    lat: float, lon: float, lat_bits: int, lon_bits: int
+) -> Tuple[int, int]:
+    """Возвращает номер ячейки по широте и долготе на сетке 2^bits."""
+    y = floor((lat + 90.0) / 180.0 * (1 << lat_bits))
+    x = floor((lon + 180.0) / 360.0 * (1 << lon_bits))
+    return (
+        min(max(y, 0), (1 << lat_bits) - 1),
+        min(max(x, 0), (1 << lon_bits) - 1),
+    )
+
+
+def _interleave(x: int, y: int, lon_bits: int, lat_bits: int) -> int:
+    """Чередует биты долготы и широты, начиная со старшего бита долготы."""
+    code = 0
+    for i in range(lon_bits + lat_bits):
+        if i % 2 == 0:
+            bit = (x >> (lon_bits - 1 - i // 2)) & 1
+        else:
+            bit = (y >> (lat_bits - 1 - i // 2)) & 1
+        code = (code << 1) | bit
+    return code
+
+
+def _to_str(code: int, precision: int) -> str:
+    """Переводит числовой код в строку base32 заданной длины."""
+    chars = []
+    for _ in range(precision):
+        chars.append(BASE32[code & 31])
+        code >>= 5
+    return "".join(reversed(chars))
+
+
+def encode(lat: float, lon: float, precision: int = MAX_PRECISION) -> str:
+    """Кодирует координаты в geohash.
+
+    Args:
+        lat: Широта в градусах.
+        lon: Долгота в градусах.
+        precision: Длина geohash в символах.
+
+    Returns:
+        Строка geohash.
+    """
+    lon_bits, lat_bits = _bits(precision)
+    y, x = _cell_xy(lat, lon, lat_bits, lon_bits)
+    return _to_str(_interleave(x, y, lon_bits, lat_bits), precision)
+
+
+def prefix_ranges(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    max_cells: int = 32,
+) -> List[Tuple[str, Optional[str]]]:
+    """Покрывает прямоугольник диапазонами geohash-префиксов.
+
+    Выбирается наибольшая точность, при которой прямоугольник пересекает не
+    больше `max_cells` ячеек; соседние по Z-порядку ячейки склеиваются в один
+    диапазон. Каждый geohash точки внутри прямоугольника лежит в одном из
+    полуинтервалов [lo, hi) при побайтовом сравнении строк.
+
+    Args:
+        lat1: Нижняя широта.
+        lon1: Левая долгота.
+        lat2: Верхняя широта.
+        lon2: Правая долгота.
+        max_cells: Максимальное количество ячеек покрытия.
+
+    Returns:
+        Список пар (lo, hi); hi равен None, если диапазон не ограничен сверху.
+    """
+    precision = 1
+    for p in range(1, MAX_PRECISION + 1):
+        lon_bits, lat_bits = _bits(p)
+        y1, x1 = _cell_xy(lat1, lon1, lat_bits, lon_bits)
+        y2, x2 = _cell_xy(lat2, lon2, lat_bits, lon_bits)
+        if (y2 - y1 + 1) * (x2 - x1 + 1) > max_cells:
+            break
+        precision = p
+
+    lon_bits, lat_bits = _bits(precision)
+    y1, x1 = _cell_xy(lat1, lon1, lat_bits, lon_bits)
+    y2, x2 = _cell_xy(lat2, lon2, lat_bits, lon_bits)
+    codes = sorted(
+        _interleave(x, y, lon_bits, lat_bits)
+        for y in range(y1, y2 + 1)
+        for x in range(x1, x2 + 1)
+    )
+
+    last = (1 << (5 * precision)) - 1
+    ranges: List[Tuple[str, Optional[str]]] = []
+    start = prev = codes[0]
+    for code in codes[1:] + [None]:
+        if code is not None and code == prev + 1:
+            prev = code
+            continue
+        hi = _to_str(prev + 1, precision) if prev < last else None
+        ranges.append((_to_str(start, precision), hi))
+        if code is not None:
+            start = prev = code
+    return ranges
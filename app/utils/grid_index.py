@@ -0,0 +1,313 @@
+from collections import defaultdict
+from math import floor, asin, cos, sin, radians, inf
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.utils.geo import (
+    EARTH_RADIUS_M,
+    bounding_box_for_radius,
+    haversine_distances_m,
+    radius_mask,
+)
+
+
+class GridIndex:
+    """Пространственный индекс точек на равномерной сетке широта/долгота.
+
+    Точка хранится в ячейке (floor(lat / cell_deg), floor(lon / lon_deg)),
+    где lon_deg — ближайший к cell_deg делитель 360, так что номер ячейки по
+    долготе берется по модулю количества столбцов и сетка замыкается через
+    антимеридиан. Запрос области перебирает только пересекающиеся с ней
+    ячейки, а если их больше, чем непустых ячеек в индексе, — только
+    непустые.
+
+    Attributes:
+        cell_deg: Размер ячейки в градусах.
+    """
+
+    def __init__(self, cell_deg: float = 0.01) -> None:
+        """Создает пустой индекс.
+
+        Args:
+            cell_deg: Размер ячейки в градусах.
+        """
+        self.cell_deg = cell_deg
+        self._columns = max(1, round(360 / cell_deg))
+        self._lon_deg = 360 / self._columns
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = (
+            defaultdict(dict)
+        )
+        # (min y, max y, min x, max x) непустых ячеек; None — пересчитать.
+        self._bounds: Tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _wrap(self, x: int) -> int:
+        half = self._columns // 2
+        return (x + half) % self._columns - half
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / self.cell_deg), self._wrap(
+            floor(lon / self._lon_deg)
+        )
+
+    def _cell_bounds(self) -> Tuple[int, int, int, int]:
+        """Возвращает границы непустых ячеек, при надобности пересчитывая."""
+        if self._bounds is None:
+            ys = [y for y, _ in self._cells]
+            xs = [x for _, x in self._cells]
+            self._bounds = (min(ys), max(ys), min(xs), max(xs))
+        return self._bounds
+
+    def clear(self) -> None:
+        """Удаляет все точки."""
+        self._points.clear()
+        self._cells.clear()
+        self._bounds = None
+
+    def upsert(self, id_: int, lat: float, lon: float) -> None:
+        """Добавляет точку или переносит существующую.
+
+        Args:
+            id_: Идентификатор точки.
+            lat: Широта.
+            lon: Долгота.
+        """
+        self.remove(id_)
+        self._points[id_] = (lat, lon)
+        y, x = key = self._cell(lat, lon)
+        self._cells[key][id_] = (lat, lon)
+        if len(self._points) == 1:
+            self._bounds = (y, y, x, x)
+        elif self._bounds is not None:
+            y_min, y_max, x_min, x_max = self._bounds
+            self._bounds = (
+                min(y_min, y),
+                max(y_max, y),
+                min(x_min, x),
+                max(x_max, x),
+            )
+
+    def remove(self, id_: int) -> None:
+        """Удаляет точку, если она есть в индексе.
+
+        Args:
+            id_: Идентификатор точки.
+        """
+        old = self._points.pop(id_, None)
+        if old is None:
+            return
+        key = self._cell(*old)
+        bucket = self._cells[key]
+        bucket.pop(id_, None)
+        if not bucket:
+            del self._cells[key]
+            # Границы пересчитываются лениво, только если опустела крайняя
+            # ячейка.
+            if self._bounds is not None and (
+                key[0] in self._bounds[:2] or key[1] in self._bounds[2:]
+            ):
+                self._bounds = None
+
+    def points_in_area(
+        self, lat1: float, lon1: float, lat2: float, lon2: float
+    ) -> List[Tuple[int, float, float]]:
+        """Возвращает точки внутри прямоугольника вместе с координатами.
+
+        Args:
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+
+        Returns:
+            Список кортежей (идентификатор, широта, долгота).
+        """
+        y1, y2 = floor(lat1 / self.cell_deg), floor(lat2 / self.cell_deg)
+        x1 = floor(lon1 / self._lon_deg)
+        width = min(floor(lon2 / self._lon_deg) - x1 + 1, self._columns)
+        if (y2 - y1 + 1) * width <= len(self._cells):
+            buckets = (
+                self._cells.get((y, self._wrap(x)))
+                for y in range(y1, y2 + 1)
+                for x in range(x1, x1 + width)
+            )
+        else:
+            buckets = (
+                b
+                for (y, x), b in self._cells.items()
+                if y1 <= y <= y2 and (x - x1) % self._columns < width
+            )
+        result: List[Tuple[int, float, float]] = []
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for id_, (lat, lon) in bucket.items():
+                if lat1 <= lat <= lat2 and lon1 <= lon <= lon2:
+                    result.append((id_, lat, lon))
+        return result
+
+    def in_area(
+        self, lat1: float, lon1: float, lat2: float, lon2: float
+    ) -> List[int]:
+        """Возвращает идентификаторы точек внутри прямоугольника.
+
+        Args:
+            lat1: Нижняя широта.
+            lon1: Левая долгота.
+            lat2: Верхняя широта.
+            lon2: Правая долгота.
+
+        Returns:
+            Список идентификаторов.
+        """
+        return [p[0] for p in self.points_in_area(lat1, lon1, lat2, lon2)]
+
+    def in_radius(
+        self, lat: float, lon: float, radius_m: float
+    ) -> List[Tuple[int, float]]:
+        """Возвращает точки в радиусе вместе с расстоянием до центра.
+
+        Args:
+            lat: Широта центра.
+            lon: Долгота центра.
+            radius_m: Радиус в метрах.
+
+        Returns:
+            Список пар (идентификатор, расстояние в метрах).
+        """
+        lat_min, lon_min, lat_max, lon_max = bounding_box_for_radius(
+            lat, lon, radius_m
+        )
+        points = self.points_in_area(lat_min, lon_min, lat_max, lon_max)
+        if not points:
+            return []
+        ids = np.fromiter((p[0] for p in points), np.int64, len(points))
+        lats = np.fromiter((p[1] for p in points), np.float64, len(points))
+        lons = np.fromiter((p[2] for p in points), np.float64, len(points))
+        mask, distances = radius_mask(lat, lon, lats, lons, radius_m)
+        return list(zip(ids[mask].tolist(), distances[mask].tolist()))
+
+    def _ring(self, cy: int, cx: int, r: int) -> List[Tuple[int, int]]:
+        """Возвращает ячейки на границе квадрата радиуса r вокруг (cy, cx).
+
+        Номера по долготе берутся по модулю количества столбцов; ячейки,
+        уже попавшие в меньшие кольца или повторяющиеся после замыкания,
+        не возвращаются.
+        """
+        if r == 0:
+            return [(cy, cx)]
+        width = min(2 * r + 1, self._columns)
+        xs = [self._wrap(x) for x in range(cx - r, cx - r + width)]
+        cells = [(cy - r, x) for x in xs] + [(cy + r, x) for x in xs]
+        if 2 * r - 1 < self._columns:
+            sides = dict.fromkeys((self._wrap(cx - r), self._wrap(cx + r)))
+            cells += [(y, x) for y in range(cy - r + 1, cy + r) for x in sides]
+        return cells
+
+    def _outside_distance(
+        self, lat: float, lon: float, cy: int, cx: int, r: int
+    ) -> float:
+        """Нижняя оценка расстояния до точек вне просмотренного квадрата.
+
+        Точка вне квадрата лежит либо за одной из его параллелей, либо за
+        одним из меридианов; расстояние до параллели считается вдоль
+        меридиана, до меридиана — по большому кругу. Долгота `lon` должна
+        лежать в ячейке столбца `cx`. Параллели за полюсами и меридианы
+        квадрата, охватившего все столбцы, не ограничивают расстояние.
+        """
+        bottom, top = (cy - r) * self.cell_deg, (cy + r + 1) * self.cell_deg
+        sides = [lat - bottom] if bottom > -90 else []
+        if top <= 90:
+            sides.append(top - lat)
+        to_parallel = EARTH_RADIUS_M * radians(min(sides)) if sides else inf
+        if 2 * r + 1 >= self._columns:
+            return to_parallel
+        d_lon = min(
+            lon - (cx - r) * self._lon_deg, (cx + r + 1) * self._lon_deg - lon
+        )
+        if d_lon >= 90:
+            # Ближайшая точка полумеридиана дальше 90° по долготе — полюс.
+            to_meridian = EARTH_RADIUS_M * radians(90 - abs(lat))
+        else:
+            to_meridian = EARTH_RADIUS_M * asin(
+                min(1.0, abs(cos(radians(lat)) * sin(radians(d_lon))))
+            )
+        return min(to_parallel, to_meridian)
+
+    def _all_nearest(
+        self, lat: float, lon: float, n: int
+    ) -> List[Tuple[int, float]]:
+        """Находит n ближайших точек полным перебором."""
+        ids = np.fromiter(self._points.keys(), np.int64, len(self._points))
+        coords = np.array(list(self._points.values()), dtype=np.float64)
+        distances = haversine_distances_m(lat, lon, coords[:, 0], coords[:, 1])
+        order = np.lexsort((ids, distances))[:n]
+        return list(zip(ids[order].tolist(), distances[order].tolist()))
+
+    def nearest(
+        self, lat: float, lon: float, n: int
+    ) -> List[Tuple[int, float]]:
+        """Возвращает n ближайших точек, расширяя кольца ячеек вокруг центра.
+
+        Поиск останавливается, как только n найденных точек гарантированно
+        ближе любой непросмотренной. Если просмотренных ячеек становится
+        больше, чем точек в индексе, выполняется полный векторизованный
+        перебор.
+
+        Args:
+            lat: Широта центра.
+            lon: Долгота центра.
+            n: Количество точек.
+
+        Returns:
+            Пары (идентификатор, расстояние в метрах) по возрастанию
+            расстояния.
+        """
+        if not self._points or n <= 0:
+            return []
+        cy, cx = self._cell(lat, lon)
+        # Долгота центра, приведенная к столбцу cx после замыкания.
+        lon_c = lon + (cx - floor(lon / self._lon_deg)) * self._lon_deg
+        y_min, y_max, x_min, x_max = self._cell_bounds()
+        r_max = max(
+            cy - y_min,
+            y_max - cy,
+            min(max(cx - x_min, x_max - cx), self._columns // 2),
+            0,
+        )
+        ids: List[int] = []
+        distances = np.empty(0, dtype=np.float64)
+        visited = 0
+        for r in range(r_max + 1):
+            ring = self._ring(cy, cx, r)
+            visited += len(ring)
+            if visited > len(self._points):
+                return self._all_nearest(lat, lon, n)
+            ring_ids: List[int] = []
+            ring_coords: List[Tuple[float, float]] = []
+            for key in ring:
+                bucket = self._cells.get(key)
+                if bucket:
+                    ring_ids.extend(bucket.keys())
+                    ring_coords.extend(bucket.values())
+            if ring_ids:
+                coords = np.array(ring_coords, dtype=np.float64)
+                ids.extend(ring_ids)
+                distances = np.concatenate(
+                    (
+                        distances,
+                        haversine_distances_m(
+                            lat, lon, coords[:, 0], coords[:, 1]
+                        ),
+                    )
+                )
+            bound = self._outside_distance(lat, lon_c, cy, cx, r)
+            if np.count_nonzero(distances <= bound) >= n:
+                break
+        ids_a = np.asarray(ids, dtype=np.int64)
+        order = np.lexsort((ids_a, distances))[:n]
+        return list(zip(ids_a[order].tolist(), distances[order].tolist()))
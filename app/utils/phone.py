@@ -0,0 +1,23 @@
+import re
+
+NON_DIGITS_RE = re.compile(r"\D")
+
+
+def normalize(number: str) -> str:
+    """Приводит телефонный номер к виду из одних цифр.
+
+    Российские номера приводятся к 11 цифрам с кодом страны 7:
+    "8 (900) 000-00-01" и "900 000-00-01" дают "79000000001".
+
+    Args:
+        number: Номер в произвольном формате.
+
+    Returns:
+        Строка цифр; пустая, если цифр в номере нет.
+    """
+    digits = NON_DIGITS_RE.sub("", number)
+    if len(digits) == 11 and digits[0] == "8":
+        return "7" + digits[1:]
+    if len(digits) == 10:
+        return "7" + digits
+    return digits
@@ -0,0 +1,142 @@
+import json
+from typing import Any, Collection, Iterable
+
+from app.models.read import ORGANIZATION_RELATIONS
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """Сериализует объект в компактный JSON без экранирования не-ASCII.
+
+    В отличие от `json.dumps` с параметрами, не создает кодировщик на
+    каждый вызов.
+
+    Args:
+        obj: JSON-совместимый объект.
+
+    Returns:
+        Строка JSON.
+    """
+    return _encoder.encode(obj)
+
+
+class OrganizationEncoder:
+    """Кодирует организации в JSON в форме `OrganizationResponse`.
+
+    Объекты читаются по атрибутам `OrganizationRead` (телефоны — строками).
+    Pydantic-модели не создаются и не валидируются: данные уже прошли
+    проверку при записи в БД. Здания и виды деятельности кодируются один
+    раз на идентификатор, дальше их фрагменты подставляются готовыми.
+    Десятичные координаты передаются строками, как это делает Pydantic.
+    Незагруженные связи не выводятся вовсе, а не пустыми списками.
+    """
+
+    def __init__(
+        self, include: Collection[str] = ORGANIZATION_RELATIONS
+    ) -> None:
+        """Создает кодировщик с пустыми кэшами фрагментов.
+
+        Args:
+            include: Выводимые связи из `ORGANIZATION_RELATIONS`.
+        """
+        self._include = frozenset(include)
+        self._buildings: dict[int, str] = {}
+        self._activities: dict[int, str] = {}
+
+    def building(self, b: Any) -> str:
+        """Возвращает JSON-фрагмент здания.
+
+        Args:
+            b: Здание с полями id, address, latitude, longitude.
+
+        Returns:
+            Фрагмент JSON.
+        """
+        fragment = self._buildings.get(b.id)
+        if fragment is None:
+            fragment = dumps(
+                {
+                    "id": b.id,
+                    "address": b.address,
+                    "latitude": str(b.latitude),
+                    "longitude": str(b.longitude),
+                }
+            )
+            self._buildings[b.id] = fragment
+        return fragment
+
+    def activity(self, a: Any) -> str:
+        """Возвращает JSON-фрагмент вида деятельности.
+
+        Args:
+            a: Вид деятельности с полями id, name, parent_id, level.
+
+        Returns:
+            Фрагмент JSON.
+        """
+        fragment = self._activities.get(a.id)
+        if fragment is None:
+            fragment = dumps(
+                {
+                    "id": a.id,
+                    "name": a.name,
+                    "parent_id": a.parent_id,
+                    "level": a.level,
+                }
+            )
+            self._activities[a.id] = fragment
+        return fragment
+
+    def organization(self, o: Any, **extra: Any) -> str:
+        """Кодирует одну организацию.
+
+        Args:
+            o: Организация с полями building, phones и activities.
+            **extra: Дополнительные поля, дописываемые в конец объекта.
+
+        Returns:
+            Строка JSON.
+        """
+        parts = [
+            '{"id":',
+            str(o.id),
+            ',"name":',
+            dumps(o.name),
+            ',"building":',
+            self.building(o.building),
+        ]
+        if "phones" in self._include:
+            parts += [',"phones":', dumps(o.phones)]
+        if "activities" in self._include:
+            parts += [
+                ',"activities":[',
+                ",".join(self.activity(a) for a in o.activities),
+                "]",
+            ]
+        for key, value in extra.items():
+            parts.append(f',"{key}":{dumps(value)}')
+        parts.append("}")
+        return "".join(parts)
+
+    def array(self, objs: Iterable[Any]) -> str:
+        """Кодирует список организаций в JSON-массив.
+
+        Args:
+            objs: Организации.
+
+        Returns:
+            Строка JSON.
+        """
+        return f"[{','.join(self.organization(o) for o in objs)}]"
+
+    def organizations(self, objs: Iterable[Any]) -> bytes:
+        """Кодирует список организаций в тело ответа.
+
+        Args:
+            objs: Организации.
+
+        Returns:
+            JSON-массив в UTF-8.
+        """
+        return self.array(objs).encode("utf-8")
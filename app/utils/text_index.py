@@ -0,0 +1,554 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, insort
+from itertools import combinations
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+WORD_RE = re.compile(r"\w+")
+# Во сколько раз списки слова могут быть длиннее числа кандидатов, чтобы
+# пересекать по спискам, а не проверять слова каждого кандидата.
+POSTINGS_TO_VERIFY_RATIO = 8
+# Размер блока ChunkedSortedList: блок делится пополам, когда становится
+# вдвое больше.
+CHUNK_SIZE = 1000
+
+
+def normalize(text: str) -> str:
+    """Приводит строку к виду для поиска без учета регистра.
+
+    Args:
+        text: Исходная строка.
+
+    Returns:
+        Нормализованная строка.
+    """
+    return text.lower()
+
+
+def ngrams(text: str, n: int = 3) -> set[str]:
+    """Возвращает множество n-грамм строки.
+
+    Args:
+        text: Нормализованная строка.
+        n: Длина n-граммы.
+
+    Returns:
+        Множество n-грамм; пустое, если строка короче n.
+    """
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+class NGramIndex:
+    """Инвертированный индекс n-грамм для поиска по подстроке.
+
+    Для каждой n-граммы хранится компактный список идентификаторов строк.
+    Поиск берет самый короткий список среди n-грамм запроса и проверяет
+    кандидатов прямым вхождением подстроки, поэтому устаревшие записи после
+    изменения или удаления строки безвредны и не требуют чистки списков.
+
+    Attributes:
+        n: Длина n-граммы.
+        texts: Нормализованные строки по идентификатору.
+    """
+
+    def __init__(self, n: int = 3) -> None:
+        """Создает пустой индекс.
+
+        Args:
+            n: Длина n-граммы.
+        """
+        self.n = n
+        self.texts: Dict[int, str] = {}
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, id_: int, text: str) -> None:
+        """Добавляет строку или заменяет строку с тем же идентификатором.
+
+        Args:
+            id_: Идентификатор строки.
+            text: Исходная строка.
+        """
+        norm = normalize(text)
+        old = self.texts.get(id_)
+        self.texts[id_] = norm
+        known = ngrams(old, self.n) if old is not None else set()
+        for gram in ngrams(norm, self.n) - known:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("i")
+            posting.append(id_)
+
+    def remove(self, id_: int) -> None:
+        """Удаляет строку из индекса.
+
+        Args:
+            id_: Идентификатор строки.
+        """
+        self.texts.pop(id_, None)
+
+    def search(self, query: str) -> List[int]:
+        """Возвращает идентификаторы строк, содержащих подстроку.
+
+        Args:
+            query: Искомая подстрока.
+
+        Returns:
+            Идентификаторы по возрастанию.
+        """
+        q = normalize(query)
+        grams = ngrams(q, self.n)
+        if grams:
+            postings = [self._postings.get(g) for g in grams]
+            if any(p is None for p in postings):
+                return []
+            candidates = min(postings, key=len)
+            texts = self.texts
+            found = {
+                id_
+                for id_ in candidates
+                if (text := texts.get(id_)) is not None and q in text
+            }
+        else:
+            found = {id_ for id_, text in self.texts.items() if q in text}
+        return sorted(found)
+
+
+def word_suffixes(text: str) -> set[str]:
+    """Возвращает суффиксы строки, начинающиеся с начала каждого слова.
+
+    Args:
+        text: Нормализованная строка.
+
+    Returns:
+        Множество суффиксов, например {"рога и копыта", "копыта"}.
+    """
+    return {text[m.start() :] for m in WORD_RE.finditer(text)}
+
+
+class ChunkedSortedList:
+    """Отсортированный список, разбитый на блоки ограниченного размера.
+
+    Вставка и удаление сдвигают элементы только внутри одного блока, поэтому
+    стоят O(log N + CHUNK_SIZE) вместо O(N) у плоского списка.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        """Создает список из элементов.
+
+        Args:
+            items: Элементы в любом порядке.
+        """
+        ordered = sorted(items)
+        self._chunks: List[List[Any]] = [
+            ordered[i : i + CHUNK_SIZE]
+            for i in range(0, len(ordered), CHUNK_SIZE)
+        ]
+        self._maxes: List[Any] = [chunk[-1] for chunk in self._chunks]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, item: Any) -> None:
+        """Вставляет элемент, сохраняя порядок.
+
+        Args:
+            item: Элемент.
+        """
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([item])
+            self._maxes.append(item)
+            return
+        i = min(bisect_left(self._maxes, item), len(self._chunks) - 1)
+        chunk = self._chunks[i]
+        insort(chunk, item)
+        self._maxes[i] = chunk[-1]
+        if len(chunk) > 2 * CHUNK_SIZE:
+            half = len(chunk) // 2
+            self._chunks[i : i + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[i : i + 1] = [chunk[half - 1], chunk[-1]]
+
+    def discard(self, item: Any) -> None:
+        """Удаляет элемент, если он есть в списке.
+
+        Args:
+            item: Элемент.
+        """
+        i = bisect_left(self._maxes, item)
+        if i == len(self._chunks):
+            return
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, item)
+        if j == len(chunk) or chunk[j] != item:
+            return
+        del chunk[j]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+
+    def irange(self, start: Any) -> Iterator[Any]:
+        """Перебирает элементы не меньше `start` по возрастанию.
+
+        Args:
+            start: Нижняя граница.
+
+        Yields:
+            Элементы списка.
+        """
+        i = bisect_left(self._maxes, start)
+        if i == len(self._chunks):
+            return
+        chunk = self._chunks[i]
+        yield from chunk[bisect_left(chunk, start) :]
+        for chunk in self._chunks[i + 1 :]:
+            yield from chunk
+
+
+class PrefixIndex:
+    """Отсортированный индекс для автодополнения по началу слов.
+
+    Для каждой строки хранятся ключи — нормализованные суффиксы от начала
+    каждого слова, поэтому запрос "коп" находит "Рога и Копыта". Поиск —
+    бинарный поиск по отсортированному списку пар (ключ, идентификатор),
+    разбитому на блоки, чтобы добавление строки не сдвигало весь список.
+
+    Attributes:
+        names: Исходные строки по идентификатору.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой индекс."""
+        self.names: Dict[int, str] = {}
+        self._entries = ChunkedSortedList()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, str]]) -> "PrefixIndex":
+        """Строит индекс целиком с одной сортировкой.
+
+        Args:
+            rows: Пары (идентификатор, строка).
+
+        Returns:
+            Заполненный индекс.
+        """
+        index = cls()
+        entries: List[Tuple[str, int]] = []
+        for id_, text in rows:
+            index.names[id_] = text
+            entries.extend(
+                (key, id_) for key in word_suffixes(normalize(text))
+            )
+        index._entries = ChunkedSortedList(entries)
+        return index
+
+    def add(self, id_: int, text: str) -> None:
+        """Добавляет строку или заменяет строку с тем же идентификатором.
+
+        Args:
+            id_: Идентификатор строки.
+            text: Исходная строка.
+        """
+        self.remove(id_)
+        self.names[id_] = text
+        for key in word_suffixes(normalize(text)):
+            self._entries.add((key, id_))
+
+    def remove(self, id_: int) -> None:
+        """Удаляет строку из индекса.
+
+        Args:
+            id_: Идентификатор строки.
+        """
+        old = self.names.pop(id_, None)
+        if old is None:
+            return
+        for key in word_suffixes(normalize(old)):
+            self._entries.discard((key, id_))
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        """Возвращает строки, у которых какое-либо слово начинается с запроса.
+
+        Args:
+            query: Начало слова или нескольких слов.
+            limit: Максимальное количество результатов.
+
+        Returns:
+            Пары (идентификатор, исходная строка) в алфавитном порядке
+            совпавших ключей.
+        """
+        q = normalize(query).lstrip()
+        if not q or limit <= 0:
+            return []
+        result: List[Tuple[int, str]] = []
+        seen: set[int] = set()
+        for key, id_ in self._entries.irange((q,)):
+            if not key.startswith(q):
+                break
+            if id_ in seen:
+                continue
+            seen.add(id_)
+            result.append((id_, self.names[id_]))
+            if len(result) >= limit:
+                break
+        return result
+
+
+def levenshtein(a: str, b: str, max_distance: int) -> int:
+    """Вычисляет расстояние Левенштейна с отсечением по порогу.
+
+    Args:
+        a: Первая строка.
+        b: Вторая строка.
+        max_distance: Порог; большие расстояния не уточняются.
+
+    Returns:
+        Расстояние или `max_distance + 1`, если оно больше порога.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(
+                min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            )
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev = cur
+    return min(prev[-1], max_distance + 1)
+
+
+def deletes(word: str, distance: int) -> set[str]:
+    """Возвращает варианты слова без не более чем `distance` символов.
+
+    Args:
+        word: Слово.
+        distance: Максимальное количество удаленных символов.
+
+    Returns:
+        Множество вариантов, включая само слово.
+    """
+    result = {word}
+    for d in range(1, min(distance, len(word)) + 1):
+        for drop in combinations(range(len(word)), d):
+            result.add("".join(c for i, c in enumerate(word) if i not in drop))
+    return result
+
+
+def allowed_distance(length: int, max_distance: int) -> int:
+    """Возвращает допустимое число опечаток в слове запроса заданной длины.
+
+    Слова короче 4 символов ищутся точно, в словах до 8 символов
+    допускается одна опечатка, в более длинных — до `max_distance`.
+
+    Args:
+        length: Длина слова запроса.
+        max_distance: Верхняя граница расстояния.
+
+    Returns:
+        Допустимое расстояние Левенштейна.
+    """
+    if length < 4:
+        return 0
+    if length < 8:
+        return min(1, max_distance)
+    return max_distance
+
+
+class FuzzyIndex:
+    """Индекс для нечеткого поиска по словам с опечатками.
+
+    Словарь слов хранит списки идентификаторов строк, а для слов словаря
+    заранее построены варианты с удаленными символами (метод SymSpell):
+    слова на расстоянии Левенштейна не больше k находятся поиском вариантов
+    слова запроса в этой таблице, без перебора словаря. Числа в таблицу
+    вариантов не попадают и ищутся точно.
+
+    Attributes:
+        max_distance: Максимальное расстояние, под которое построен индекс.
+        texts: Нормализованные строки по идентификатору.
+    """
+
+    def __init__(self, max_distance: int = 2) -> None:
+        """Создает пустой индекс.
+
+        Args:
+            max_distance: Максимальное расстояние Левенштейна.
+        """
+        self.max_distance = max_distance
+        self.texts: Dict[int, str] = {}
+        self._postings: Dict[str, array] = {}
+        self._deletes: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _index_distance(self, length: int) -> int:
+        """Возвращает глубину вариантов для слова словаря.
+
+        Она равна наибольшему расстоянию, допустимому для слов запроса,
+        которые могут оказаться не дальше этого расстояния от слова.
+        """
+        k = self.max_distance
+        return max(
+            (
+                d
+                for n in range(max(length - k, 1), length + k + 1)
+                if abs(n - length) <= (d := allowed_distance(n, k))
+            ),
+            default=0,
+        )
+
+    def _add_word(self, word: str, id_: int) -> None:
+        posting = self._postings.get(word)
+        if posting is None:
+            posting = self._postings[word] = array("i")
+            if not word.isdigit():
+                distance = self._index_distance(len(word))
+                for variant in deletes(word, distance):
+                    self._deletes.setdefault(variant, []).append(word)
+        posting.append(id_)
+
+    def add(self, id_: int, text: str) -> None:
+        """Добавляет строку или заменяет строку с тем же идентификатором.
+
+        Args:
+            id_: Идентификатор строки.
+            text: Исходная строка.
+        """
+        self.remove(id_)
+        norm = normalize(text)
+        self.texts[id_] = norm
+        for word in set(WORD_RE.findall(norm)):
+            self._add_word(word, id_)
+
+    def remove(self, id_: int) -> None:
+        """Удаляет строку из индекса.
+
+        Args:
+            id_: Идентификатор строки.
+        """
+        old = self.texts.pop(id_, None)
+        if old is None:
+            return
+        for word in set(WORD_RE.findall(old)):
+            posting = self._postings.get(word)
+            if posting is not None and id_ in posting:
+                posting.remove(id_)
+
+    def similar_words(self, word: str, max_distance: int) -> Dict[str, int]:
+        """Находит слова словаря на расстоянии не больше заданного.
+
+        Args:
+            word: Нормализованное слово запроса.
+            max_distance: Максимальное расстояние Левенштейна.
+
+        Returns:
+            Слова словаря с расстоянием до слова запроса.
+        """
+        distance = min(
+            allowed_distance(len(word), max_distance), self.max_distance
+        )
+        if distance == 0 or word.isdigit():
+            return {word: 0} if word in self._postings else {}
+        result: Dict[str, int] = {}
+        for variant in deletes(word, distance):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in result:
+                    continue
+                d = levenshtein(word, candidate, distance)
+                if d <= distance:
+                    result[candidate] = d
+        return result
+
+    def _matches(self, similar: Dict[str, int]) -> Dict[int, int]:
+        """Собирает строки, содержащие одно из похожих слов.
+
+        Args:
+            similar: Слова словаря с расстоянием до слова запроса.
+
+        Returns:
+            Наименьшее расстояние по идентификатору строки.
+        """
+        result: Dict[int, int] = {}
+        for word, d in similar.items():
+            for id_ in self._postings[word]:
+                if d < result.get(id_, d + 1):
+                    result[id_] = d
+        return result
+
+    def search(
+        self,
+        query: str,
+        max_distance: int | None = None,
+        limit: int | None = None,
+        after: Tuple[int, int] | None = None,
+    ) -> List[Tuple[int, int]]:
+        """Возвращает строки, содержащие все слова запроса с опечатками.
+
+        Кандидаты берутся из списков самого редкого слова запроса. Остальные
+        слова пересекаются по спискам, если они не намного длиннее числа
+        кандидатов, иначе проверяются по словам самих кандидатов.
+
+        Args:
+            query: Поисковый запрос.
+            max_distance: Максимальное расстояние для слова, по умолчанию —
+                расстояние, под которое построен индекс.
+            limit: Если задано, возвращаются только первые `limit` строк.
+            after: Если задано, только строки после ключа
+                (расстояние, id) (keyset-пагинация).
+
+        Returns:
+            Пары (идентификатор, суммарное расстояние) по возрастанию
+            расстояния, затем id.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        words = set(WORD_RE.findall(normalize(query)))
+        similar = [self.similar_words(w, max_distance) for w in words]
+        if not similar or not all(similar):
+            return []
+        similar.sort(key=lambda m: sum(len(self._postings[w]) for w in m))
+        scores = self._matches(similar[0])
+        for matched in similar[1:]:
+            size = sum(len(self._postings[w]) for w in matched)
+            if size <= POSTINGS_TO_VERIFY_RATIO * len(scores):
+                other = self._matches(matched)
+                scores = {
+                    id_: score + other[id_]
+                    for id_, score in scores.items()
+                    if id_ in other
+                }
+                continue
+            narrowed: Dict[int, int] = {}
+            for id_, score in scores.items():
+                best = min(
+                    (
+                        matched[w]
+                        for w in WORD_RE.findall(self.texts[id_])
+                        if w in matched
+                    ),
+                    default=None,
+                )
+                if best is not None:
+                    narrowed[id_] = score + best
+            scores = narrowed
+        keys = [(score, id_) for id_, score in scores.items()]
+        if after is not None:
+            keys = [k for k in keys if k > after]
+        keys = (
+            heapq.nsmallest(limit, keys) if limit is not None else sorted(keys)
+        )
+        return [(id_, score) for score, id_ in keys]
@@ -0,0 +1,52 @@
+"""Сравнивает скалярный и векторизованный Хаверсин на 1k, 10k и 100k точек.
+
+Запуск: python scripts/bench_geo.py
+"""
+
+import random
+from timeit import timeit
+
+import numpy as np
+
+from app.utils.geo import haversine_distance_m, radius_mask
+
+CENTER = (55.7512440, 37.6184230)
+RADIUS_M = 2000.0
+SIZES = (1_000, 10_000, 100_000)
+REPEAT = 5
+
+
+def scalar(lats: list[float], lons: list[float]) -> list[int]:
+    """Построчная фильтрация, как в исходном filter_by_radius."""
+    return [
+        i
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+        if haversine_distance_m(CENTER[0], CENTER[1], lat, lon) <= RADIUS_M
+    ]
+
+
+def batch(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Векторизованная фильтрация одним проходом."""
+    mask, _ = radius_mask(CENTER[0], CENTER[1], lats, lons, RADIUS_M)
+    return np.flatnonzero(mask)
+
+
+def main() -> None:
+    rnd = random.Random(42)
+    print(f"{'points':>8} {'scalar, ms':>12} {'batch, ms':>12} {'speedup':>8}")
+    for n in SIZES:
+        lats = [CENTER[0] + rnd.uniform(-0.05, 0.05) for _ in range(n)]
+        lons = [CENTER[1] + rnd.uniform(-0.05, 0.05) for _ in range(n)]
+        lats_a = np.asarray(lats)
+        lons_a = np.asarray(lons)
+        assert scalar(lats, lons) == batch(lats_a, lons_a).tolist()
+        t_scalar = timeit(lambda: scalar(lats, lons), number=REPEAT) / REPEAT
+        t_batch = timeit(lambda: batch(lats_a, lons_a), number=REPEAT) / REPEAT
+        print(
+            f"{n:>8} {t_scalar * 1000:>12.2f} {t_batch * 1000:>12.2f}"
+            f" {t_scalar / t_batch:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Замеряет поиск по подстроке названия на 1M организаций.
+
+По умолчанию сравнивает in-process индекс триграмм с линейным просмотром
+и замеряет автодополнение по индексу начал слов и нечеткий поиск: время
+построения, прирост RSS процесса и задержку запросов каждого индекса.
+С флагом --db создает во временной таблице 1M названий и сравнивает в БД
+запрос `lower(name) LIKE '%...%'` по GIN-индексу pg_trgm с
+последовательным сканированием (нужна БД из .env с расширением pg_trgm).
+
+Названия собираются из словаря случайных произносимых слов (по умолчанию
+30 тысяч) с частотами, убывающими примерно как 1/ранг, чтобы таблицы
+индексов имели размер, близкий к реальному.
+
+Запуск: python scripts/bench_name_search.py [--db] [--size N] [--words N]
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+from time import perf_counter
+
+from app.utils.text_index import (
+    FuzzyIndex,
+    NGramIndex,
+    PrefixIndex,
+    normalize,
+)
+
+FORMS = ["ООО", "ИП", "АО", "ЗАО", "ПАО"]
+CONSONANTS = "бвгдзклмнпрстфхцчш"
+VOWELS = "аеиоуыэюя"
+VOCABULARY_SIZE = 30_000
+REPEAT = 20
+
+
+def make_vocabulary(size: int) -> list[str]:
+    """Генерирует воспроизводимый словарь различных слов из 2-4 слогов."""
+    rnd = random.Random(7)
+    words: dict[str, None] = {}
+    while len(words) < size:
+        syllables = rnd.randint(2, 4)
+        word = "".join(
+            rnd.choice(CONSONANTS) + rnd.choice(VOWELS)
+            for _ in range(syllables)
+        )
+        words.setdefault(word.capitalize())
+    return list(words)
+
+
+def pick_word(rnd: random.Random, vocabulary: list[str]) -> str:
+    """Выбирает слово с вероятностью, примерно обратной его рангу."""
+    return vocabulary[int(len(vocabulary) ** rnd.random()) - 1]
+
+
+def make_names(size: int, vocabulary: list[str]) -> list[str]:
+    """Генерирует воспроизводимые названия вида 'ООО Кабура Тилоне 123'."""
+    rnd = random.Random(42)
+    return [
+        f"{rnd.choice(FORMS)} {pick_word(rnd, vocabulary)}"
+        f" {pick_word(rnd, vocabulary)} {i}"
+        for i in range(size)
+    ]
+
+
+def typo(word: str, position: int) -> str:
+    """Заменяет букву слова на следующую гласную или согласную."""
+    letters = VOWELS if word[position] in VOWELS else CONSONANTS
+    replacement = letters[(letters.index(word[position]) + 1) % len(letters)]
+    return word[:position] + replacement + word[position + 1 :]
+
+
+def make_queries(
+    vocabulary: list[str],
+) -> tuple[list[str], list[str], list[str]]:
+    """Строит запросы по частым, средним и редким словам словаря.
+
+    Returns:
+        Запросы по подстроке, по префиксу и нечеткие.
+    """
+    common, middle, rare = (
+        normalize(vocabulary[rank]) for rank in (0, 300, 5000)
+    )
+    substring = [common[:3], middle, f"{rare} 12", "ооо " + common, "zzz"]
+    prefixes = ["о", common[:2], middle, f"{rare} 12345", "zzz"]
+    fuzzy = [
+        typo(common, 1),
+        f"{typo(middle, 2)} {common}",
+        typo(rare, 3),
+        f"{typo(rare, 1)} {typo(middle, 3)}",
+        "zzzz",
+    ]
+    return substring, prefixes, fuzzy
+
+
+def rss_mb() -> float:
+    """Возвращает текущий RSS процесса в мегабайтах.
+
+    На Linux читается /proc/self/statm, иначе берется пиковый RSS.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def bench_memory(size: int, vocabulary_size: int) -> None:
+    """Сравнивает индекс триграмм с линейным просмотром в памяти."""
+    vocabulary = make_vocabulary(vocabulary_size)
+    names = make_names(size, vocabulary)
+    queries, prefix_queries, fuzzy_queries = make_queries(vocabulary)
+    print(f"{size} names, {len(vocabulary)} distinct words")
+
+    rss = rss_mb()
+    started = perf_counter()
+    index = NGramIndex()
+    for i, name in enumerate(names):
+        index.add(i, name)
+    print(
+        f"trigram index build: {perf_counter() - started:.1f} s,"
+        f" +{rss_mb() - rss:.0f} MB RSS"
+    )
+    normalized = [normalize(n) for n in names]
+
+    print(f"{'query':>20} {'hits':>8} {'scan, ms':>10} {'index, ms':>10}")
+    for q in queries:
+        started = perf_counter()
+        expected = [i for i, n in enumerate(normalized) if q in n]
+        t_scan = perf_counter() - started
+        started = perf_counter()
+        for _ in range(REPEAT):
+            found = index.search(q)
+        t_index = (perf_counter() - started) / REPEAT
+        assert found == expected
+        print(
+            f"{q:>20} {len(found):>8} {t_scan * 1000:>10.1f}"
+            f" {t_index * 1000:>10.2f}"
+        )
+
+    rss = rss_mb()
+    started = perf_counter()
+    prefixes = PrefixIndex.build(enumerate(names))
+    print(
+        f"\nprefix index build: {perf_counter() - started:.1f} s,"
+        f" +{rss_mb() - rss:.0f} MB RSS"
+    )
+    print(f"{'prefix':>20} {'hits':>8} {'suggest, ms':>12}")
+    for q in prefix_queries:
+        started = perf_counter()
+        for _ in range(1000):
+            found = prefixes.search(q, 10)
+        t_suggest = (perf_counter() - started) / 1000
+        print(f"{q:>20} {len(found):>8} {t_suggest * 1000:>12.4f}")
+
+    rss = rss_mb()
+    started = perf_counter()
+    fuzzy = FuzzyIndex()
+    for i, name in enumerate(names):
+        fuzzy.add(i, name)
+    print(
+        f"\nfuzzy index build: {perf_counter() - started:.1f} s,"
+        f" +{rss_mb() - rss:.0f} MB RSS"
+    )
+    print(f"{'query':>20} {'hits':>8} {'top 100, ms':>12} {'all, ms':>10}")
+    for q in fuzzy_queries:
+        started = perf_counter()
+        for _ in range(REPEAT):
+            found = fuzzy.search(q, limit=100)
+        t_top = (perf_counter() - started) / REPEAT
+        started = perf_counter()
+        hits = len(fuzzy.search(q))
+        t_all = perf_counter() - started
+        print(f"{q:>20} {hits:>8} {t_top * 1000:>12.2f} {t_all * 1000:>10.2f}")
+
+
+async def bench_db(size: int, vocabulary_size: int) -> None:
+    """Сравнивает GIN-индекс pg_trgm с последовательным сканированием."""
+    from sqlalchemy import text
+
+    from app.database import engine
+
+    vocabulary = make_vocabulary(vocabulary_size)
+    queries, _, _ = make_queries(vocabulary)
+    forms = ",".join(f"'{f}'" for f in FORMS)
+    # Слово выбирается с вероятностью ~1/ранг, как в make_names.
+    word = (
+        "(CAST(:words AS text[]))"
+        "[floor(power(cardinality(CAST(:words AS text[])), random()))::int]"
+    )
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text("SELECT setseed(0.42)"))
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE bench_org AS "
+                f"SELECT g AS id, (ARRAY[{forms}])[1 + g % {len(FORMS)}]"
+                f" || ' ' || {word} || ' ' || {word}"
+                " || ' ' || g AS name "
+                f"FROM generate_series(1, {size}) g"
+            ),
+            {"words": vocabulary},
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX ON bench_org "
+                "USING gin (lower(name) gin_trgm_ops)"
+            )
+        )
+        await conn.execute(text("ANALYZE bench_org"))
+        query = text(
+            "SELECT id FROM bench_org WHERE lower(name) LIKE :p "
+            "ORDER BY id LIMIT 100"
+        )
+        print(f"{'query':>20} {'seqscan, ms':>12} {'trgm, ms':>10}")
+        for q in queries:
+            timings = []
+            for use_index in (False, True):
+                flag = "on" if use_index else "off"
+                await conn.execute(text(f"SET enable_bitmapscan = {flag}"))
+                started = perf_counter()
+                for _ in range(5):
+                    await conn.execute(query, {"p": f"%{q}%"})
+                timings.append((perf_counter() - started) / 5)
+            print(
+                f"{q:>20} {timings[0] * 1000:>12.1f}"
+                f" {timings[1] * 1000:>10.1f}"
+            )
+        await conn.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", action="store_true")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--words", type=int, default=VOCABULARY_SIZE)
+    args = parser.parse_args()
+    if args.db:
+        asyncio.run(bench_db(args.size, args.words))
+    else:
+        bench_memory(args.size, args.words)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Сравнивает сериализацию страницы организаций через Pydantic и напрямую.
+
+Pydantic-путь повторяет то, что раньше делал обработчик: строит модели
+ответа по каждой организации, FastAPI превращает их в словари, валидирует
+по `response_model` и сериализует. Быстрый путь — `OrganizationEncoder`.
+Данные — модели чтения `OrganizationRead`, БД не нужна.
+
+Запуск: python scripts/bench_serialization.py
+"""
+
+import json
+import random
+from decimal import Decimal
+from timeit import timeit
+
+from pydantic import TypeAdapter
+
+from app.models.read import ActivityRead, BuildingRead, OrganizationRead
+from app.schemas.activity import ActivityResponse
+from app.schemas.building import BuildingResponse
+from app.schemas.organization import OrganizationResponse
+from app.utils.serialization import OrganizationEncoder
+
+SIZES = (100, 1_000)
+BUILDINGS = 200
+ACTIVITIES = 50
+REPEAT = 20
+
+adapter = TypeAdapter(list[OrganizationResponse])
+
+
+def make_organizations(n: int) -> list[OrganizationRead]:
+    """Создает n организаций на общих зданиях и видах деятельности."""
+    rnd = random.Random(42)
+    buildings = [
+        BuildingRead(
+            id=i,
+            address=f"г. Москва, ул. Тверская, д. {i}",
+            latitude=Decimal(f"{55 + rnd.random():.6f}"),
+            longitude=Decimal(f"{37 + rnd.random():.6f}"),
+        )
+        for i in range(1, BUILDINGS + 1)
+    ]
+    activities = [
+        ActivityRead(id=i, name=f"Вид {i}", parent_id=None, level=1)
+        for i in range(1, ACTIVITIES + 1)
+    ]
+    organizations = []
+    for i in range(1, n + 1):
+        building = rnd.choice(buildings)
+        organizations.append(
+            OrganizationRead(
+                id=i,
+                name=f'ООО "Организация {i}"',
+                building_id=building.id,
+                building=building,
+                phones=[f"8-923-{i:03d}-{k:02d}" for k in range(2)],
+                activities=rnd.sample(activities, 2),
+            )
+        )
+    return organizations
+
+
+def to_response(objs: list[OrganizationRead]) -> list[OrganizationResponse]:
+    """Строит Pydantic-модель ответа на каждую организацию."""
+    return [
+        OrganizationResponse(
+            id=o.id,
+            name=o.name,
+            building=BuildingResponse(
+                id=o.building.id,
+                address=o.building.address,
+                latitude=o.building.latitude,
+                longitude=o.building.longitude,
+            ),
+            activities=[
+                ActivityResponse(
+                    id=a.id, name=a.name, parent_id=a.parent_id, level=a.level
+                )
+                for a in o.activities
+            ],
+            phones=list(o.phones),
+        )
+        for o in objs
+    ]
+
+
+def pydantic_path(objs: list[OrganizationRead]) -> bytes:
+    """Модели ответа, повторная валидация по response_model и dump_json."""
+    content = [r.model_dump() for r in to_response(objs)]
+    return adapter.dump_json(adapter.validate_python(content))
+
+
+def fast_path(objs: list[OrganizationRead]) -> bytes:
+    """Прямая сериализация с переиспользованием фрагментов."""
+    return OrganizationEncoder().organizations(objs)
+
+
+def main() -> None:
+    print(f"{'rows':>6} {'pydantic, ms':>13} {'fast, ms':>10} {'speedup':>8}")
+    for n in SIZES:
+        objs = make_organizations(n)
+        assert json.loads(pydantic_path(objs)) == json.loads(fast_path(objs))
+        t_old = timeit(lambda: pydantic_path(objs), number=REPEAT) / REPEAT
+        t_new = timeit(lambda: fast_path(objs), number=REPEAT) / REPEAT
+        print(
+            f"{n:>6} {t_old * 1000:>13.2f} {t_new * 1000:>10.2f}"
+            f" {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
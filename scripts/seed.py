@@ -5,6 +5,7 @@ import asyncio
 from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.crud_activity import activity_crud
 from app.database import AsyncSessionLocal
 from app.models.activity import Activity
 from app.models.building import Building
@@ -127,13 +128,7 @@ async def upsert_activities(session: AsyncSession) -> None:
             select(Activity).where(Activity.id == a["id"])
         )
         if exists.scalar_one_or_none() is None:
-            obj = Activity(
-                id=a["id"],
-                name=a["name"],
-                parent_id=a["parent_id"],
-                level=a["level"],
-            )
-            session.add(obj)
+            await activity_crud.create(session, a)
     await session.flush()
 
 